@@ -0,0 +1,90 @@
+"""JSON Formatter micro-benchmark
+
+Measures the number of records per second formatted by the JsonFormatter.
+
+Usage:
+
+    python -m benchmarks.json_formatter [--records N]
+"""
+import argparse
+import logging
+import timeit
+from functools import partial
+
+from logging_utilities.formatters.json_formatter import JsonFormatter
+
+# Format of the README "Case 2. JSON Output Configured within Python Code"
+CASE_2_FORMAT = {
+    "Name": "name",
+    "Levelno": "levelno",
+    "Levelname": "levelname",
+    "Pathname": "pathname",
+    "Filename": "filename",
+    "Module": "module",
+    "Lineno": "lineno",
+    "FuncName": "funcName",
+    "Created": "created",
+    "Asctime": "asctime",
+    "Msecs": "msecs",
+    "RelativeCreated": "relativeCreated",
+    "Thread": "thread",
+    "ThreadName": "threadName",
+    "Process": "process",
+    "Message": "message"
+}
+
+STYLE_FORMAT = {
+    "time": "%(asctime)s.%(msecs)03d",
+    "level": "levelname",
+    "logger": "name",
+    "pid_tid": "%(process)x/%(thread)x",
+    "request": {
+        "path": "request.path", "method": "request.method", "headers": "request.headers."
+    },
+    "message": "%(message)s",
+}
+
+BENCHMARKS = [
+    ('case-2', CASE_2_FORMAT, {}),
+    ('case-2-orjson', CASE_2_FORMAT, {
+        'encoder': 'orjson'
+    }),
+    ('case-2-pre-encode', CASE_2_FORMAT, {
+        'pre_encode': True
+    }),
+    ('style-dotted-keys', STYLE_FORMAT, {
+        'ignore_missing': True
+    }),
+]
+
+
+def make_record():
+    record = logging.LogRecord(
+        'benchmark', logging.INFO, __file__, 10, 'Composed message %s', ('benchmark',), None
+    )
+    record.request = {
+        'path': '/my/path', 'method': 'GET', 'headers': {
+            'Host': 'example.com', 'Accept': '*/*'
+        }
+    }
+    return record
+
+
+def run(records, repeat):
+    for name, fmt, kwargs in BENCHMARKS:
+        formatter = JsonFormatter(fmt, **kwargs)
+        record = make_record()
+        best = min(timeit.repeat(partial(formatter.format, record), number=records, repeat=repeat))
+        print('{:<20} {:>10.0f} records/s'.format(name, records / best))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=20000, help='Records per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs')
+    args = parser.parse_args()
+    run(args.records, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Log record creation micro-benchmark
+
+Measures the number of records per second created by the standard LogRecord and by the ignore
+missing log records (see logging_utilities.log_record), and the number of ignore missing records
+per second formatted by a standard formatter referencing a missing attribute. The chained logging
+context, ignore missing factory and constant filter are also compared with the composed record
+factory (see compose_log_record_factory()).
+
+Usage:
+
+    python -m benchmarks.log_record [--records N]
+"""
+import argparse
+import logging
+import timeit
+from functools import partial
+
+from logging_utilities.context import remove_logging_context
+from logging_utilities.context import set_logging_context
+from logging_utilities.context.thread_context import ThreadMappingContext
+from logging_utilities.filters import ConstAttribute
+from logging_utilities.log_record import LogRecordIgnoreMissing
+from logging_utilities.log_record import compose_log_record_factory
+from logging_utilities.log_record import reset_log_record_factory
+from logging_utilities.log_record import set_log_record_ignore_missing_factory
+
+RECORD_ARGS = ('benchmark', logging.INFO, __file__, 10, 'Composed message %s', ('benchmark',), None)
+
+
+def make_factory_record():
+    return logging.getLogRecordFactory()(*RECORD_ARGS)
+
+
+def run(records, repeat):
+    benchmarks = [
+        ('LogRecord', partial(logging.LogRecord, *RECORD_ARGS)),
+        ('LogRecordIgnoreMissing', partial(LogRecordIgnoreMissing, *RECORD_ARGS)),
+    ]
+    for name, create in benchmarks:
+        best = min(timeit.repeat(create, number=records, repeat=repeat))
+        print('{:<24} {:>10.0f} records/s'.format(name, records / best))
+
+    set_log_record_ignore_missing_factory()
+    try:
+        best = min(timeit.repeat(make_factory_record, number=records, repeat=repeat))
+    finally:
+        reset_log_record_factory()
+    print('{:<24} {:>10.0f} records/s'.format('ignore missing factory', records / best))
+
+    const_filter = ConstAttribute(service='benchmark', environment='test')
+
+    def make_chained_record():
+        record = make_factory_record()
+        const_filter.filter(record)
+        return record
+
+    set_log_record_ignore_missing_factory()
+    set_logging_context({'request_id': 'benchmark'})
+    try:
+        best = min(timeit.repeat(make_chained_record, number=records, repeat=repeat))
+    finally:
+        remove_logging_context()
+        reset_log_record_factory()
+    print('{:<24} {:>10.0f} records/s'.format('chained factories', records / best))
+
+    context = ThreadMappingContext()
+    context['request_id'] = 'benchmark'
+    logging.setLogRecordFactory(
+        compose_log_record_factory(
+            base_factory=logging.LogRecord,
+            context=context,
+            constants=const_filter.kwargs,
+            ignore_missing=True
+        )
+    )
+    try:
+        best = min(timeit.repeat(make_factory_record, number=records, repeat=repeat))
+    finally:
+        reset_log_record_factory()
+    print('{:<24} {:>10.0f} records/s'.format('composed factory', records / best))
+
+    formatter = logging.Formatter('%(levelname)s:%(message)s:%(missing)s')
+    record = LogRecordIgnoreMissing(*RECORD_ARGS)
+    best = min(timeit.repeat(partial(formatter.format, record), number=records, repeat=repeat))
+    print('{:<24} {:>10.0f} records/s'.format('format missing', records / best))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=100000, help='Records per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs')
+    args = parser.parse_args()
+    run(args.records, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
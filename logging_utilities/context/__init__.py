@@ -1,3 +1,4 @@
 from .context import get_logging_context
+from .context import init_logging_context
 from .context import remove_logging_context
 from .context import set_logging_context
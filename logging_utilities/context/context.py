@@ -20,17 +20,36 @@ def set_logging_context(context=None):
             `get_logging_context()`
     '''
     global __record_factory_wrapped  # pylint: disable=global-statement, invalid-name
-    global __context  # pylint: disable=global-statement, invalid-name
     current_factory = logging.getLogRecordFactory()
-    if __context is None:
-        __context = ThreadMappingContext()
-    __context.init(context)
+    logging_context = init_logging_context(context)
     if current_factory != __record_factory_wrapped:
         __initial_record_factory = logging.getLogRecordFactory()
-        __record_factory_wrapped = __wrap_log_record_with_context(current_factory, __context)
+        __record_factory_wrapped = __wrap_log_record_with_context(current_factory, logging_context)
         logging.setLogRecordFactory(__record_factory_wrapped)
 
 
+def init_logging_context(context=None):
+    '''Initialize the logging context without setting the log record factory
+
+    The logging context is created if not yet set and initialized with `context`. Unlike
+    `set_logging_context()`, the context is not added to the log records, this is up to the
+    caller (e.g. `compose_log_record_factory(logging_context=True)`).
+
+    Args:
+        context: (dict, None)
+            Context to set, by default `None`. The context can be later retrieved and modified using
+            `get_logging_context()`
+
+    Returns:
+        The logging context
+    '''
+    global __context  # pylint: disable=global-statement, invalid-name
+    if __context is None:
+        __context = ThreadMappingContext()
+    __context.init(context)
+    return __context
+
+
 def get_logging_context():
     '''Return the current logging context if set or `None` otherwise'''
     return __context
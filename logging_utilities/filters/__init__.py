@@ -1,6 +1,7 @@
 import logging
-from datetime import datetime
-from datetime import timezone
+
+from logging_utilities.levels import get_levelno
+from logging_utilities.timestamps import IsoTimestamp
 
 
 class ConstAttribute(logging.Filter):
@@ -20,8 +21,7 @@ class ConstAttribute(logging.Filter):
         super().__init__()
 
     def filter(self, record):
-        for key, value in self.kwargs.items():
-            setattr(record, key, value)
+        record.__dict__.update(self.kwargs)
         return True
 
 
@@ -76,18 +76,7 @@ class LevelFilter(logging.Filter):
         Raises:
             ValueError: when an invalid level is given
         '''
-        if not isinstance(level, (str, int)):
-            raise ValueError('Unsupported level type: must be int or string')
-        self.level = level
-        if isinstance(self.level, str):
-            # translate level to int
-            self.level = logging.getLevelName(self.level)
-            if not isinstance(self.level, int):
-                raise ValueError('Unsupported level string')
-        elif isinstance(self.level, int) \
-            and logging.getLevelName(self.level) == "Level %d" % (self.level):
-            raise ValueError('Undefined level integer')
-
+        self.level = get_levelno(level)
         self.logger = logger
         super().__init__()
 
@@ -98,6 +87,73 @@ class LevelFilter(logging.Filter):
         return True
 
 
+class LoggersLevelFilter(logging.Filter):
+    '''Logging level filter for multiple loggers
+
+    Like LevelFilter but with a level per logger in a single filter. The loggers match on the
+    dotted name boundaries; e.g. the level of logger 'A' applies to 'A' and 'A.B' but not to
+    'AB'. When several loggers match, the level of the most specific one (longest name) is used.
+
+    filters:
+        libraries_filter:
+            (): logging_utilities.filters.LoggersLevelFilter
+            levels:
+                urllib3: "WARNING"
+                botocore: "ERROR"
+                botocore.credentials: "INFO"
+    '''
+
+    def __init__(self, levels=None):
+        '''Initialize the filter
+
+        Args:
+            levels: (dict)
+                Mapping of logger names to level (str|int), all messages of these loggers (and
+                of their children) with a lower level will be filtered. The empty logger name
+                applies to all loggers.
+
+        Raises:
+            ValueError: when an invalid level is given
+        '''
+        self.levels = {logger: get_levelno(level) for logger, level in (levels or {}).items()}
+        # The logger names are stored in a trie of their dotted parts, each node is a
+        # (level, children) list.
+        self._trie = [self.levels.get('', logging.NOTSET), {}]
+        for logger, level in self.levels.items():
+            if logger == '':
+                continue
+            node = self._trie
+            for part in logger.split('.'):
+                node = node[1].setdefault(part, [None, {}])
+            node[0] = level
+        # The level resolved for a logger name is cached
+        self._cache = {}
+        super().__init__()
+
+    def get_level(self, name):
+        '''Returns the level applied to the given logger name'''
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+        node = self._trie
+        level = node[0]
+        for part in name.split('.'):
+            node = node[1].get(part)
+            if node is None:
+                break
+            if node[0] is not None:
+                level = node[0]
+        self._cache[name] = level
+        return level
+
+    def filter(self, record):
+        try:
+            return record.levelno >= self._cache[record.name]
+        except KeyError:
+            return record.levelno >= self.get_level(record.name)
+
+
 class TimeAttribute(logging.Filter):
     '''Logging time record attribute
 
@@ -117,12 +173,13 @@ class TimeAttribute(logging.Filter):
         '''
         self.isotime = isotime
         self.utc_isotime = utc_isotime
+        self._isotime = IsoTimestamp()
+        self._utc_isotime = IsoTimestamp(utc=True)
         super().__init__()
 
     def filter(self, record):
         if self.isotime:
-            record.isotime = datetime.fromtimestamp(record.created).astimezone().isoformat()
+            record.isotime = self._isotime.render(record.created)
         if self.utc_isotime:
-            record.utc_isotime = datetime.fromtimestamp(record.created, tz=timezone.utc) \
-                .isoformat().replace('+00:00', 'Z')
+            record.utc_isotime = self._utc_isotime.render(record.created)
         return True
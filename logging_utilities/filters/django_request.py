@@ -7,6 +7,9 @@ from types import GeneratorType
 
 from django.http import HttpRequest
 
+from logging_utilities.formatters.json_encoders import RawJSON
+from logging_utilities.serializers import get_serializer
+
 # From python3.7, dict is ordered. Ordered dict are preferred in order to keep the json output
 # in the same order as its definition
 if sys.version_info.major >= 3 and sys.version_info.minor >= 7:
@@ -92,25 +95,36 @@ class JsonDjangoRequest(logging.Filter):
             dotted_key = '{}.{}'.format(prefix, key)
             if not self._add_key(dotted_key, key):
                 continue
-            if hasattr(value, '__dict__'):
-                json_obj[key] = self._jsonify_dict(dotted_key, value.__dict__)
-            elif isinstance(value, dict):
-                json_obj[key] = self._jsonify_dict(dotted_key, value)
-            elif isinstance(value, (str, int, float, type(None), bool, tuple, list)):
-                json_obj[key] = value
-            elif isinstance(value, (bytes)):
-                json_obj[key] = str(value)
-            elif isinstance(value, (GeneratorType, Token)):
-                json_obj[key] = repr(value)
-            else:
-                warnings.warn(
-                    "Cannot jsonify key {} with value {}: unsupported type={}".format(
-                        dotted_key, value, type(value)
-                    )
-                )
-                json_obj[key] = str(value)
+            json_obj[key] = self._jsonify_value(dotted_key, value)
         return json_obj
 
+    def _jsonify_value(self, dotted_key, value):
+        # The serializers registry has precedence, this way the registered types are serialized
+        # the same way as by the JsonFormatter (e.g. Enum, bytes or objects with a __dict__)
+        serializer = get_serializer(type(value))
+        if serializer is not None:
+            return self._jsonify_serialized(dotted_key, value, serializer(value))
+        if hasattr(value, '__dict__') or isinstance(value, dict):
+            return self._jsonify_dict(dotted_key, getattr(value, '__dict__', value))
+        if isinstance(value, (GeneratorType, Token)):
+            return repr(value)
+        if not isinstance(value, (str, int, float, type(None), bool, tuple, list, RawJSON)):
+            warnings.warn(
+                "Cannot jsonify key {} with value {}: unsupported type={}".format(
+                    dotted_key, value, type(value)
+                )
+            )
+            value = str(value)
+        return value
+
+    def _jsonify_serialized(self, dotted_key, value, serialized):
+        # The serialized value might again need to be jsonified (e.g. dataclass as dictionary)
+        if isinstance(serialized, dict):
+            return self._jsonify_dict(dotted_key, serialized)
+        if type(serialized) is not type(value):  # pylint: disable=unidiomatic-typecheck
+            return self._jsonify_value(dotted_key, serialized)
+        return serialized
+
     def _add_key(self, dotted_key, key):
         return self._include_key(dotted_key, key) and not self._exclude_key(dotted_key, key)
 
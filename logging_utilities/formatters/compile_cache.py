@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+# Process wide caches of the parsed fmt files and of the compiled fmt definitions, this way
+# the formatters configured identically (e.g. by logging.config.dictConfig() in every worker
+# process) share the same parsed and compiled definitions.
+
+
+class CompileCache:
+    '''Thread safe bounded LRU cache'''
+
+    def __init__(self, maxsize):
+        '''Initialize the cache
+
+        Args:
+            maxsize: (int)
+                Maximum number of cached items
+        '''
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, key, create):
+        '''Returns the cached item, create it if not cached
+
+        Args:
+            key: (hashable)
+                Cache key
+            create: (callable)
+                Function without argument creating the item
+        '''
+        with self._lock:
+            try:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            except KeyError:
+                pass
+        item = create()
+        with self._lock:
+            item = self._cache.setdefault(key, item)
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return item
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+FMT_FILE_CACHE = CompileCache(64)
+PLAN_CACHE = CompileCache(256)
+
+
+def load_fmt_file(path, object_pairs_hook):
+    '''Load a JSON fmt file
+
+    The parsed file is cached by its path, modification time and size. NOTE: the returned fmt is
+    shared and must not be modified.
+
+    Args:
+        path: (string)
+            Path of the JSON file
+        object_pairs_hook: (callable)
+            json.load() object_pairs_hook
+    '''
+
+    def load():
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file, object_pairs_hook=object_pairs_hook)
+
+    key = (os.path.realpath(path),) + fmt_file_version(path) + (object_pairs_hook,)
+    return FMT_FILE_CACHE.get(key, load)
+
+
+def fmt_file_version(path):
+    '''Returns the version of a fmt file as (modification time in ns, size)
+
+    Raises:
+        OSError if the file doesn't exist or is not accessible
+    '''
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def fmt_key(fmt):
+    '''Returns a hashable key of a fmt definition
+
+    The dictionaries order is kept as it defines the JSON output order, but their type is ignored
+    so an OrderedDict and a dict with the same items have the same key.
+
+    Raises:
+        TypeError if the fmt contains an unhashable value
+    '''
+    if isinstance(fmt, Mapping):
+        return ('{', tuple((key, fmt_key(value)) for key, value in fmt.items()))
+    if isinstance(fmt, list):
+        return ('[', tuple(fmt_key(value) for value in fmt))
+    hash(fmt)
+    return (type(fmt), fmt)
+
+
+def clear_compile_caches():
+    '''Clear the parsed fmt files and compiled fmt definitions caches'''
+    FMT_FILE_CACHE.clear()
+    PLAN_CACHE.clear()
@@ -0,0 +1,105 @@
+import builtins
+import threading
+from collections import OrderedDict
+
+# ExceptionGroup have sub exceptions that are not part of the fingerprint, they are not cached
+_EXCEPTION_GROUP = getattr(builtins, 'BaseExceptionGroup', ())  # pylint: disable=invalid-name
+
+
+def exception_fingerprint(exc_type, exc_value, exc_tb):
+    '''Returns a fingerprint of the exception
+
+    The fingerprint identifies the formatted traceback of the exception; it is made of the
+    exception type, message, notes and traceback frames (code object, line number and last
+    instruction) of the exception and of its chained exceptions (cause or context).
+
+    Args:
+        exc_type: (type)
+            Exception type
+        exc_value: (BaseException)
+            Exception
+        exc_tb: (traceback)
+            Exception traceback
+
+    Returns:
+        The hashable fingerprint or None if the exception cannot be fingerprinted
+    '''
+    fingerprint = []
+    seen = set()
+    while True:
+        if exc_value is None or isinstance(exc_value, _EXCEPTION_GROUP):
+            return None
+        try:
+            message = str(exc_value)
+            notes = tuple(str(note) for note in getattr(exc_value, '__notes__', ()))
+        except Exception:  # pylint: disable=broad-except
+            return None
+        frames = []
+        while exc_tb is not None:
+            frames.append((exc_tb.tb_frame.f_code, exc_tb.tb_lineno, exc_tb.tb_lasti))
+            exc_tb = exc_tb.tb_next
+        fingerprint.append((exc_type, message, notes, tuple(frames)))
+        seen.add(id(exc_value))
+
+        if exc_value.__cause__ is not None:
+            chained = exc_value.__cause__
+            fingerprint.append('cause')
+        elif exc_value.__context__ is not None and not exc_value.__suppress_context__:
+            chained = exc_value.__context__
+            fingerprint.append('context')
+        else:
+            break
+        if id(chained) in seen:
+            break
+        exc_type, exc_value, exc_tb = type(chained), chained, chained.__traceback__
+    return tuple(fingerprint)
+
+
+class ExceptionTextCache:
+    '''Bounded LRU cache of formatted exceptions
+
+    The formatted exceptions are cached by their fingerprint (see exception_fingerprint()), this
+    way the same exception raised from the same code path is only formatted once. The cache is
+    thread safe.
+    '''
+
+    def __init__(self, maxsize):
+        '''Initialize the cache
+
+        Args:
+            maxsize: (int)
+                Maximum number of formatted exceptions in the cache
+        '''
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, exc_info, format_exception):
+        '''Returns the formatted exception
+
+        Args:
+            exc_info: (tuple)
+                Exception info tuple (type, value, traceback)
+            format_exception: (callable)
+                Function formatting the exception info when not in cache
+
+        Returns:
+            The formatted exception
+        '''
+        key = exception_fingerprint(*exc_info)
+        if key is None:
+            return format_exception(exc_info)
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+                return text
+        text = format_exception(exc_info)
+        with self._lock:
+            self._cache[key] = text
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return text
@@ -0,0 +1,291 @@
+import json
+import math
+import re
+import threading
+import uuid
+import warnings
+from json.encoder import encode_basestring
+from json.encoder import encode_basestring_ascii
+
+# pylint: disable=import-outside-toplevel,import-error
+
+# All encoders have a `separators` attribute with the (item_separator, key_separator) used in
+# their output. It is None when the output cannot be built by concatenating the encoded items
+# (e.g. with indentation or sorted keys).
+# The `encode_value()` method is used to encode a single value of the output and the
+# `scalar_encoders` attribute maps scalar types to faster encoding functions for such values.
+# The `encode_bytes()` method returns the output encoded in UTF-8.
+# RawJSON values are supported by all encoders, see _RawJSONHook.
+
+
+class RawJSON:
+    '''Already serialized JSON
+
+    The JSON text is inserted verbatim into the output, without being parsed nor encoded again.
+    NOTE: the JSON text is not validated.
+    '''
+    __slots__ = ('json',)
+
+    def __init__(self, json_text):
+        '''Initialize the raw JSON
+
+        Args:
+            json_text: (string|bytes)
+                Serialized JSON value
+        '''
+        if isinstance(json_text, (bytes, bytearray)):
+            json_text = json_text.decode('utf-8')
+        self.json = json_text
+
+    def __repr__(self):
+        return 'RawJSON({!r})'.format(self.json)
+
+
+def _raw_json_text(obj):
+    return obj.json
+
+
+class _RawJSONLocal(threading.local):
+    # Class default avoids an AttributeError in threads that didn't encode any RawJSON yet
+    raw_jsons = None
+
+
+class _RawJSONHook:
+    '''Encoder default hook for RawJSON
+
+    The JSON libraries cannot insert raw JSON, therefore the RawJSON values are encoded as unique
+    string placeholders that are replaced by the raw JSON in the encoded output. The RawJSON of
+    the current encoding are kept in a thread local list.
+    '''
+
+    def __init__(self, default):
+        self.default = default
+        self._local = _RawJSONLocal()
+        nonce = uuid.uuid4().hex
+        self._placeholder = '__raw_json_' + nonce + '_{}__'
+        pattern = '"__raw_json_' + nonce + r'_(\d+)__"'
+        self._pattern = re.compile(pattern)
+        self._bytes_pattern = re.compile(pattern.encode('ascii'))
+
+    def __call__(self, obj):
+        if isinstance(obj, RawJSON):
+            raw_jsons = self._local.raw_jsons
+            if raw_jsons is None:
+                raw_jsons = self._local.raw_jsons = []
+            raw_jsons.append(obj.json)
+            return self._placeholder.format(len(raw_jsons) - 1)
+        if self.default is None:
+            raise TypeError('Object of type {} is not JSON serializable'.format(type(obj).__name__))
+        return self.default(obj)
+
+    def replace(self, output):
+        raw_jsons = self._local.raw_jsons
+        if raw_jsons is None:
+            return output
+        self._local.raw_jsons = None
+        if isinstance(output, bytes):
+            return self._bytes_pattern.sub(
+                lambda match: raw_jsons[int(match.group(1))].encode('utf-8'), output
+            )
+        return self._pattern.sub(lambda match: raw_jsons[int(match.group(1))], output)
+
+
+class JsonEncoder:
+    """Python standard library json encoder
+
+    All `json.dumps()` parameters are supported. The encoder instance is created once and reused
+    for every encoding.
+    """
+    name = 'json'
+
+    def __init__(self, default=None, cls=None, **kwargs):
+        if cls is None:
+            cls = json.JSONEncoder
+        self._encoder = cls(default=default, **kwargs)
+        # the encoder default might be a method of a JSONEncoder subclass
+        self._raw_json = _RawJSONHook(self._encoder.default)
+        self._encoder.default = self._raw_json
+        self.separators = None
+        if self._encoder.indent is None and not self._encoder.sort_keys:
+            self.separators = (self._encoder.item_separator, self._encoder.key_separator)
+        # JSONEncoder.encode() creates a new iterator encoder for every non string value, which
+        # is quite costly for single values, therefore the scalar values are directly encoded.
+        self.scalar_encoders = {RawJSON: _raw_json_text}
+        if cls is json.JSONEncoder:
+            self.scalar_encoders = {
+                RawJSON: _raw_json_text,
+                str: encode_basestring_ascii if self._encoder.ensure_ascii else encode_basestring,
+                int: int.__repr__,
+                float: self._encode_float,
+                bool: {
+                    True: 'true', False: 'false'
+                }.__getitem__,
+            }
+
+    def encode(self, obj):
+        return self._raw_json.replace(self._encoder.encode(obj))
+
+    def encode_bytes(self, obj):
+        return self.encode(obj).encode('utf-8')
+
+    def encode_value(self, obj):
+        if obj is None:
+            return 'null'
+        encode = self.scalar_encoders.get(type(obj))
+        if encode is not None:
+            return encode(obj)
+        return self.encode(obj)
+
+    def _encode_float(self, obj):
+        if math.isfinite(obj):
+            return float.__repr__(obj)
+        # NaN and Infinity depends on the allow_nan parameter
+        return self._encoder.encode(obj)
+
+
+class OrjsonEncoder:
+    """orjson encoder
+
+    Supported `json.dumps()` parameters:
+        default:      default serializer for unsupported types
+        sort_keys:    mapped to orjson.OPT_SORT_KEYS
+        indent:       only `2` is supported, mapped to orjson.OPT_INDENT_2
+        ensure_ascii: only `False` is supported, orjson always outputs UTF-8
+    """
+    name = 'orjson'
+
+    def __init__(self, default=None, sort_keys=False, indent=None, ensure_ascii=False, **kwargs):
+        import orjson
+        _raise_on_unsupported_kwargs(self.name, kwargs)
+        if ensure_ascii:
+            raise ValueError('ensure_ascii=True is not supported by orjson')
+        # non str keys are converted to str like with the standard json library
+        self.option = orjson.OPT_NON_STR_KEYS
+        self.separators = None if sort_keys or indent else (',', ':')
+        if sort_keys:
+            self.option |= orjson.OPT_SORT_KEYS
+        if indent == 2:
+            self.option |= orjson.OPT_INDENT_2
+        elif indent is not None:
+            raise ValueError('indent={} is not supported by orjson, only 2'.format(indent))
+        self._raw_json = _RawJSONHook(default)
+        self._dumps = orjson.dumps
+        self.scalar_encoders = {RawJSON: _raw_json_text}
+
+    def encode(self, obj):
+        return self.encode_bytes(obj).decode('utf-8')
+
+    def encode_bytes(self, obj):
+        return self._raw_json.replace(self._dumps(obj, default=self._raw_json, option=self.option))
+
+    encode_value = encode
+
+
+class UjsonEncoder:
+    """ujson encoder
+
+    Supported `json.dumps()` parameters:
+        default, sort_keys, indent, ensure_ascii and separators
+    """
+    name = 'ujson'
+
+    def __init__(self, **kwargs):
+        import ujson
+        _raise_on_unsupported_kwargs(
+            self.name,
+            kwargs,
+            supported=('default', 'sort_keys', 'indent', 'ensure_ascii', 'separators')
+        )
+        self._raw_json = _RawJSONHook(kwargs.get('default'))
+        # ujson escape by default the forward slashes, the standard json library doesn't
+        self.kwargs = dict(kwargs, default=self._raw_json, escape_forward_slashes=False)
+        self.separators = None
+        if not kwargs.get('sort_keys') and not kwargs.get('indent'):
+            self.separators = kwargs.get('separators', (',', ':'))
+        self._dumps = ujson.dumps
+        self.scalar_encoders = {RawJSON: _raw_json_text}
+
+    def encode(self, obj):
+        return self._raw_json.replace(self._dumps(obj, **self.kwargs))
+
+    def encode_bytes(self, obj):
+        return self.encode(obj).encode('utf-8')
+
+    encode_value = encode
+
+
+class MsgspecEncoder:
+    """msgspec encoder
+
+    Supported `json.dumps()` parameters:
+        default:      mapped to msgspec enc_hook
+        sort_keys:    mapped to msgspec order='sorted'
+        ensure_ascii: only `False` is supported, msgspec always outputs UTF-8
+    """
+    name = 'msgspec'
+
+    def __init__(self, default=None, sort_keys=False, ensure_ascii=False, **kwargs):
+        import msgspec
+        _raise_on_unsupported_kwargs(self.name, kwargs)
+        if ensure_ascii:
+            raise ValueError('ensure_ascii=True is not supported by msgspec')
+        self._raw_json = _RawJSONHook(default)
+        self._encoder = msgspec.json.Encoder(
+            enc_hook=self._raw_json, order='sorted' if sort_keys else None
+        )
+        self.separators = None if sort_keys else (',', ':')
+        self.scalar_encoders = {RawJSON: _raw_json_text}
+
+    def encode(self, obj):
+        return self.encode_bytes(obj).decode('utf-8')
+
+    def encode_bytes(self, obj):
+        return self._raw_json.replace(self._encoder.encode(obj))
+
+    encode_value = encode
+
+
+JSON_ENCODERS = {
+    encoder.name: encoder for encoder in [JsonEncoder, OrjsonEncoder, UjsonEncoder, MsgspecEncoder]
+}
+
+
+def _raise_on_unsupported_kwargs(name, kwargs, supported=()):
+    unsupported = sorted(set(kwargs) - set(supported))
+    if unsupported:
+        raise ValueError('{} parameters are not supported by {}'.format(unsupported, name))
+
+
+def get_json_encoder(name='json', **kwargs):
+    '''Returns the json encoder backend
+
+    When the backend library is not installed or doesn't support one of the parameters, then the
+    python standard library json encoder is used instead.
+
+    Args:
+        name: (string)
+            Name of the json encoder backend; 'json', 'orjson', 'ujson' or 'msgspec'
+        kwargs:
+            `json.dumps()` parameters
+
+    Raises:
+        ValueError: when the encoder name is unknown
+    '''
+    try:
+        encoder_class = JSON_ENCODERS[name]
+    except KeyError as error:
+        raise ValueError(
+            'Unknown json encoder "{}", must be one of {}'.format(name, list(JSON_ENCODERS))
+        ) from error
+    try:
+        return encoder_class(**kwargs)
+    except ImportError:
+        warnings.warn(
+            '{} json encoder is not installed, fallback to the json standard library'.format(name),
+            UserWarning
+        )
+    except ValueError as error:
+        warnings.warn(
+            '{}, fallback to the json standard library encoder'.format(error), UserWarning
+        )
+    return JsonEncoder(**kwargs)
@@ -1,9 +1,13 @@
+# pylint: disable=too-many-lines
 import json
 import logging
 import logging.config
+import operator
 import re
 import sys
+import time
 import warnings
+import weakref
 from collections import OrderedDict
 from collections.abc import Mapping
 from collections.abc import MutableMapping
@@ -15,8 +19,21 @@ from logging import StrFormatStyle as _StrFormatStyle
 from logging import StringTemplateStyle as _StringTemplateStyle
 
 from logging_utilities.formatters import RECORD_DFT_ATTR
+from logging_utilities.formatters.compile_cache import PLAN_CACHE
+from logging_utilities.formatters.compile_cache import fmt_file_version
+from logging_utilities.formatters.compile_cache import fmt_key
+from logging_utilities.formatters.compile_cache import load_fmt_file
+from logging_utilities.formatters.exception_cache import ExceptionTextCache
+from logging_utilities.formatters.json_encoders import get_json_encoder
+from logging_utilities.formatters.limits import TRUNCATED_MARKER
+from logging_utilities.formatters.limits import ValueLimiter
+from logging_utilities.formatters.structured_exception import \
+    structure_exception
+from logging_utilities.formatters.structured_exception import structure_stack
+from logging_utilities.levels import get_levelno
 from logging_utilities.log_record import _DictIgnoreMissing
-from logging_utilities.log_record import set_log_record_ignore_missing_factory
+from logging_utilities.serializers import serialize
+from logging_utilities.timestamps import StrftimeTimestamp
 
 if sys.version_info.major < 3:
     raise ImportError('Only python 3 is supported')  # pragma: no cover
@@ -100,6 +117,42 @@ else:  # pragma: no cover
             logging._releaseLock()
 
 
+# Regex to extract the record attributes from the style formats
+_STYLE_FIELDS = {
+    '%': re.compile(r'%\(([^)]+)\)'),
+    '{': re.compile(r'{([^{}!:\[]+)'),
+    '$': re.compile(r'\$\{?([_a-z][_a-z0-9.]*)', re.I),
+}
+
+
+class _RecordMapping:
+    """Mapping view of the record attributes used for the string formatting
+
+    Dotted keys (e.g. `request.path`) are resolved on demand against the record dictionary
+    attributes, this way only the keys referenced by the format are looked up.
+    """
+    __slots__ = ('dct', 'ignore_missing')
+
+    def __init__(self, dct, ignore_missing):
+        self.dct = dct
+        self.ignore_missing = ignore_missing
+
+    def __getitem__(self, key):
+        if '.' in key:
+            value = self.dct
+            for sub_key in key.split('.'):
+                if not isinstance(value, (dict, MutableMapping)) or sub_key not in value:
+                    break
+                value = value[sub_key]
+            else:
+                return value
+        if key in self.dct:
+            return self.dct[key]
+        if self.ignore_missing:
+            return _DictIgnoreMissing._dft_value  # pylint: disable=protected-access
+        raise KeyError(key)
+
+
 class EnhancedPercentStyle(PercentStyle):
     validation_pattern = re.compile(
         r'%\([\w\.]+\)[#0+ -]*(\*|\d+)?(\.(\*|\d+))?[diouxefgcrsa%]', re.I
@@ -110,18 +163,438 @@ class EnhancedPercentStyle(PercentStyle):
         self.ignore_missing = ignore_missing
 
     def _format(self, record):
-        dct = {**record.__dict__, **flatten_dict(record.__dict__)}
-        if self.ignore_missing:
-            return self._fmt % _DictIgnoreMissing(dct)
-        return self._fmt % dct
+        return self._fmt % _RecordMapping(record.__dict__, self.ignore_missing)
+
+
+class EnhancedStrFormatStyle(StrFormatStyle):
+
+    def __init__(self, fmt, ignore_missing=False):
+        super().__init__(fmt)
+        self.ignore_missing = ignore_missing
+
+    def _format(self, record):
+        return self._fmt.format_map(_RecordMapping(record.__dict__, self.ignore_missing))
+
+
+class EnhancedStringTemplateStyle(StringTemplateStyle):
+
+    def __init__(self, fmt, ignore_missing=False):
+        super().__init__(fmt)
+        self.ignore_missing = ignore_missing
+
+    def _format(self, record):
+        return self._tpl.substitute(_RecordMapping(record.__dict__, self.ignore_missing))
 
 
+# The enhanced styles look up the record attributes through _RecordMapping, this way the missing
+# attributes are ignored by the formatter itself without changing the log record factory.
 _ENHANCED_STYLES = {
     '%': (EnhancedPercentStyle, BASIC_FORMAT),
-    '{': (StrFormatStyle, '{levelname}:{name}:{message}'),
-    '$': (StringTemplateStyle, '${levelname}:${name}:${message}'),
+    '{': (EnhancedStrFormatStyle, '{levelname}:{name}:{message}'),
+    '$': (EnhancedStringTemplateStyle, '${levelname}:${name}:${message}'),
 }
 
+# Sentinel returned by the fields getter when the value must not be added to the output
+# (see remove_empty)
+_SKIP = object()
+
+
+def _is_empty_string(value):
+    return value == ''
+
+
+def _is_none(value):
+    return value is None
+
+
+# Empty dictionary used as intermediate value when a dotted key parent is missing (never modified)
+_EMPTY_DICT = dictionary()
+
+
+def _render_object(fields, record):
+    message = dictionary()
+    for key, field in fields:
+        value = field.get(record)
+        if value is not _SKIP:
+            message[key] = value
+    return message
+
+
+def _render_list(fields, record):
+    message = []
+    for field in fields:
+        value = field.get(record)
+        if value is not _SKIP:
+            message.append(value)
+    return message
+
+
+class _ConstantField:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self, record):
+        return self.value
+
+
+class _ExcInfoField:
+    __slots__ = ()
+
+    def get(self, record):
+        # exc_info might be true or contain exception info. We add it here only a boolean to
+        # know if the message has exception info or not. The info itself will be in
+        # 'exc_text' and is always appended to the json output when not available
+        return bool(record.exc_info)
+
+
+class _AttributeField:
+    """Record attribute, when the attribute is missing the fallback field is used"""
+    __slots__ = ('name', 'fallback', 'is_empty')
+
+    def __init__(self, name, fallback, is_empty):
+        self.name = name
+        self.fallback = fallback
+        self.is_empty = is_empty
+
+    def get(self, record):
+        dct = record.__dict__
+        if self.name not in dct:
+            return self.fallback.get(record)
+        value = dct[self.name]
+        if self.is_empty is not None and self.is_empty(value):
+            return _SKIP
+        return value
+
+
+class _StyleField:
+    __slots__ = ('style', 'remove_empty')
+
+    def __init__(self, style, remove_empty):
+        self.style = style
+        self.remove_empty = remove_empty
+
+    def get(self, record):
+        value = self.style.format(record)
+        if self.remove_empty and not value:
+            return _SKIP
+        return value
+
+
+class _DottedKeyField:
+    """Dotted key (e.g. `request.path`), the key is split once into a path of keys"""
+    __slots__ = ('dotted_key', 'parents', 'key', 'default_value', 'ignore_missing', 'remove_empty')
+
+    def __init__(self, dotted_key, ignore_missing, remove_empty):
+        self.dotted_key = dotted_key
+        self.default_value = ''
+        if dotted_key.endswith('..'):
+            # if the dotted key has two trailing dot, this means that the value must be a list
+            # therefore set the default value to an empty list
+            self.default_value = []
+            dotted_key = dotted_key[:-2]
+        elif dotted_key.endswith('.'):
+            # if the dotted key has a trailing dot, this mean that the value must be a dict
+            # therefore set the default value to an empty dictionary.
+            self.default_value = dictionary()
+            dotted_key = dotted_key[:-1]
+        path = tuple(dotted_key.split('.'))
+        self.parents = path[:-1]
+        self.key = path[-1]
+        self.ignore_missing = ignore_missing
+        self.remove_empty = remove_empty
+
+    def get(self, record):
+        dct = record.__dict__
+        for key in self.parents:
+            if not isinstance(dct, (dict, Mapping)):
+                raise self._not_a_mapping_error(dct)  # pragma: no cover
+            dct = dct.get(key, _EMPTY_DICT)
+        if not isinstance(dct, (dict, Mapping)):
+            raise self._not_a_mapping_error(dct)  # pragma: no cover
+        if self.ignore_missing:
+            value = dct.get(self.key, self.default_value)
+        else:
+            try:
+                value = dct[self.key]
+            except KeyError as error:
+                raise ValueError('Key "{}" not found in log record'.format(self.key)) from error
+        if self.remove_empty and not value:
+            return _SKIP
+        return value
+
+    def _not_a_mapping_error(self, dct):
+        return ValueError(
+            'Cannot get dotted key "{}" from "{}": '.format(self.dotted_key, dct) +
+            'is not a record or dictionary'
+        )
+
+
+class _StructuredExcField:
+    """Exception as structured data, see structure_exception()"""
+    __slots__ = ('field',)
+
+    def __init__(self, field):
+        self.field = field
+
+    def get(self, record):
+        exc_info = record.exc_info
+        if isinstance(exc_info, tuple) and exc_info[1] is not None:
+            return structure_exception(exc_info[1])
+        # e.g. a record received from another process has only the exception text
+        return self.field.get(record)
+
+
+class _StructuredStackField:
+    """Stack information as a list of frames, see structure_stack()"""
+    __slots__ = ('field',)
+
+    def __init__(self, field):
+        self.field = field
+
+    def get(self, record):
+        value = self.field.get(record)
+        if isinstance(value, str) and value:
+            return structure_stack(value)
+        return value
+
+
+class _LimitedField:
+    """Field whose value is limited in size, see ValueLimiter"""
+    __slots__ = ('field', 'limiter', 'depth')
+
+    def __init__(self, field, limiter, depth):
+        self.field = field
+        self.limiter = limiter
+        self.depth = depth
+
+    def get(self, record):
+        value = self.field.get(record)
+        if value is _SKIP:
+            return value
+        return self.limiter.limit(value, self.depth)
+
+
+class _ConstAttributeField:
+    """Record attribute with a constant value (e.g. added by the ConstAttribute filter)
+
+    The value field is the attribute field with its limits, the attribute field is used to
+    detect, by identity, that the value is unchanged (see _ConstAttributesFragment).
+    """
+    __slots__ = ('field', 'value_field')
+
+    def __init__(self, field, value_field):
+        self.field = field
+        self.value_field = value_field
+
+    def get(self, record):
+        return self.value_field.get(record)
+
+
+class _ObjectField:
+    __slots__ = ('fields', 'remove_empty')
+
+    def __init__(self, fields, remove_empty):
+        self.fields = fields
+        self.remove_empty = remove_empty
+
+    def get(self, record):
+        value = _render_object(self.fields, record)
+        if self.remove_empty and len(value) == 0:
+            return _SKIP
+        return value
+
+
+class _ListField:
+    __slots__ = ('fields', 'remove_empty')
+
+    def __init__(self, fields, remove_empty):
+        self.fields = fields
+        self.remove_empty = remove_empty
+
+    def get(self, record):
+        value = _render_list(self.fields, record)
+        if self.remove_empty and len(value) == 0:
+            return _SKIP
+        return value
+
+
+class _ConstantFragment:
+    """JSON fragment of a constant, encoded once"""
+    __slots__ = ('fragment',)
+
+    def __init__(self, fragment):
+        self.fragment = fragment
+
+    def get(self, record):
+        return self.fragment
+
+
+class _ConstAttributesFragment:
+    """JSON fragment of consecutive constant record attributes (see const_attributes)
+
+    The attributes are encoded together once and encoded again only when one of the attribute
+    values is not the same object anymore.
+    """
+    __slots__ = ('names', 'defaults', 'fields', 'encoder', '_cache')
+
+    def __init__(self, items, encoder):
+        # items are (key, _ConstAttributeField, prefix)
+        self.names = tuple(field.field.name for _, field, _ in items)
+        self.defaults = (_SKIP,) * len(items)
+        self.fields = [(key, field.value_field, prefix) for key, field, prefix in items]
+        self.encoder = encoder
+        # (values, parts, fragment) replaced atomically, so the fragment can be shared between
+        # threads
+        self._cache = (None, None, None)
+
+    def _lookup(self, record):
+        values = tuple(map(record.__dict__.get, self.names, self.defaults))
+        cached_values, parts, fragment = self._cache
+        if cached_values is None or not all(map(operator.is_, values, cached_values)):
+            encode_value = self.encoder.encode_value
+            scalar_encoders = self.encoder.scalar_encoders
+            parts = []
+            for key, field, prefix in self.fields:
+                value = field.get(record)
+                if value is not _SKIP:
+                    parts.append(
+                        (key, prefix + scalar_encoders.get(type(value), encode_value)(value))
+                    )
+            fragment = _SKIP
+            if parts:
+                fragment = self.encoder.separators[0].join(part for _, part in parts)
+            self._cache = (values, parts, fragment)
+        return parts, fragment
+
+    def get(self, record):
+        return self._lookup(record)[1]
+
+    def get_parts(self, record):
+        """Returns the (key, encoded key and value) of each attribute"""
+        return self._lookup(record)[0]
+
+
+def _render_fragments(items, record, encoder):
+    # The items are (key, getter, encoded, prefix) where the getter is either a field that returns
+    # a value to encode or a fragment that returns an already encoded value.
+    encode_value = encoder.encode_value
+    scalar_encoders = encoder.scalar_encoders
+    parts = []
+    for _, getter, encoded, prefix in items:
+        value = getter.get(record)
+        if value is _SKIP:
+            continue
+        if not encoded:
+            value = scalar_encoders.get(type(value), encode_value)(value)
+        parts.append(prefix + value)
+    return parts
+
+
+class _ObjectFragment:
+    __slots__ = ('items', 'remove_empty', 'encoder')
+
+    def __init__(self, items, remove_empty, encoder):
+        self.items = items
+        self.remove_empty = remove_empty
+        self.encoder = encoder
+
+    def get(self, record):
+        parts = _render_fragments(self.items, record, self.encoder)
+        if self.remove_empty and not parts:
+            return _SKIP
+        return '{' + self.encoder.separators[0].join(parts) + '}'
+
+    def get_with_extra(self, record, extra):
+        # The extra are added at the end of the object, unless the object has already the key,
+        # in this case the extra overwrite the object value.
+        encode_value = self.encoder.encode_value
+        item_separator, key_separator = self.encoder.separators
+        parts = []
+        indexes = {}
+        for key, getter, encoded, prefix in self.items:
+            if isinstance(getter, _ConstAttributesFragment):
+                for const_key, part in getter.get_parts(record):
+                    indexes[const_key] = len(parts)
+                    parts.append(part)
+                continue
+            value = getter.get(record)
+            if value is not _SKIP:
+                indexes[key] = len(parts)
+                parts.append(prefix + (value if encoded else encode_value(value)))
+        for key, value in extra.items():
+            part = encode_value(key) + key_separator + encode_value(value)
+            if key in indexes:
+                parts[indexes[key]] = part
+            else:
+                parts.append(part)
+        return '{' + item_separator.join(parts) + '}'
+
+
+class _ListFragment:
+    __slots__ = ('items', 'remove_empty', 'encoder')
+
+    def __init__(self, items, remove_empty, encoder):
+        self.items = items
+        self.remove_empty = remove_empty
+        self.encoder = encoder
+
+    def get(self, record):
+        parts = _render_fragments(self.items, record, self.encoder)
+        if self.remove_empty and not parts:
+            return _SKIP
+        return '[' + self.encoder.separators[0].join(parts) + ']'
+
+
+def _encode_key(encoder, key):
+    # Like json.dumps, non string keys are converted to their json representation
+    if not isinstance(key, str):
+        key = encoder.encode_value(key)
+    return encoder.encode_value(key)
+
+
+def _compile_fragment_item(key, field, prefix, encoder):
+    if isinstance(field, _ObjectField):
+        return (
+            key, _compile_object_fragment(field.fields, field.remove_empty, encoder), True, prefix
+        )
+    if isinstance(field, _ListField):
+        items = [_compile_fragment_item(None, item, '', encoder) for item in field.fields]
+        return (key, _ListFragment(items, field.remove_empty, encoder), True, prefix)
+    if isinstance(field, _ConstantField):
+        return (key, _ConstantFragment(encoder.encode_value(field.value)), True, prefix)
+    return (key, field, False, prefix)
+
+
+def _compile_object_fragment(fields, remove_empty, encoder):
+    items = []
+    const_items = []
+    for key, field in fields:
+        prefix = _encode_key(encoder, key) + encoder.separators[1]
+        if isinstance(field, _ConstAttributeField):
+            const_items.append((key, field, prefix))
+            continue
+        if const_items:
+            items.append((None, _ConstAttributesFragment(const_items, encoder), True, ''))
+            const_items = []
+        items.append(_compile_fragment_item(key, field, prefix, encoder))
+    if const_items:
+        items.append((None, _ConstAttributesFragment(const_items, encoder), True, ''))
+    return _ObjectFragment(items, remove_empty, encoder)
+
+
+class _FormatPlan:
+    """Compiled fmt definition"""
+    __slots__ = ('json_fmt', 'fields', 'fragment', 'uses_time', 'excluded_attrs')
+
+    def __init__(self, json_fmt, fields, fragment, uses_time, excluded_attrs):
+        self.json_fmt = json_fmt
+        self.fields = fields
+        self.fragment = fragment
+        self.uses_time = uses_time
+        self.excluded_attrs = excluded_attrs
+
 
 def deep_merge(a, b):
     result = a.copy()
@@ -133,13 +606,13 @@ def deep_merge(a, b):
     return result
 
 
-class JsonFormatter(logging.Formatter):
+class JsonFormatter(logging.Formatter):  # pylint: disable=too-many-instance-attributes
     """Logging JSON Formatter
 
     This formatter transform the log message into a JSON object.
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-locals,too-many-statements
         self,
         fmt=None,
         fmtFile=None,
@@ -149,6 +622,22 @@ class JsonFormatter(logging.Formatter):
         filter_attributes=None,
         remove_empty=False,
         ignore_missing=False,
+        encoder='json',
+        pre_encode=False,
+        bytes_output=False,
+        exc_cache_size=0,
+        exclude_fmt_attributes=False,
+        max_string_length=None,
+        max_list_items=None,
+        max_depth=None,
+        max_record_size=None,
+        drop_priority=None,
+        level_fmt=None,
+        logger_fmt=None,
+        fmt_reload_interval=None,
+        memoize_output=False,
+        structured_exc=False,
+        const_attributes=None,
         **kwargs
     ):
         """JSON Formatter constructor
@@ -158,8 +647,9 @@ class JsonFormatter(logging.Formatter):
                 Format for the json output. It can be a string representing a json object or
                 a dictionary. The object defines the JSON output:
                     KEY   := key to use in the json output
-                    VALUE := value to use in the json output, this can be either a static string,
-                             a record attribute name or a format string
+                    VALUE := value to use in the json output, this can be either a constant
+                             (number, boolean or null), a record attribute name or a format
+                             string
             fmtFile: (string)
                 Path to a JSON file containing the fmt definition. This is an alternative to the fmt
                 parameter. If both are provided, the fmt parameter will be merged with the fmtFile
@@ -183,41 +673,292 @@ class JsonFormatter(logging.Formatter):
             ignore_missing: (bool)
                 If True, then all extra attributes from the log record that are missing (accessed
                 by the fmt parameter) will be replaced by an empty string instead of raising a
-                ValueError exception.
-                NOTE: This has an impact on all formater not only on this one,
-                see log_record.LogRecordIgnoreMissing.
+                ValueError exception. This only applies to this formatter, the log record
+                factory is not changed (see log_record.LogRecordIgnoreMissing for a global
+                alternative).
+            encoder: (string)
+                JSON encoder backend to use; 'json' (python standard library), 'orjson', 'ujson'
+                or 'msgspec'. When the backend is not installed or doesn't support the kwargs,
+                the standard library is used instead.
+            pre_encode: (bool)
+                If True, the fmt keys and constant values are encoded once to JSON fragments and
+                the JSON output is built by concatenating these fragments with the encoded record
+                values, without building an intermediate dictionary. This option is ignored when
+                the output is indented or has sorted keys.
+            bytes_output: (bool)
+                If True, the formatted output is returned as UTF-8 encoded bytes instead of a
+                string and non ASCII characters are not escaped (ensure_ascii=False by default).
+                This output must be used with a binary handler (see
+                logging_utilities.handlers.BinaryStreamHandler).
+            exc_cache_size: (int)
+                Maximum number of formatted exceptions kept in a LRU cache. The same exception
+                raised from the same code path (same type, message and traceback frames) is then
+                only formatted once. 0 disables the cache.
+            exclude_fmt_attributes: (bool)
+                If True, the record attributes referenced by the fmt are not added again to the
+                output as extra when using add_always_extra.
+            max_string_length: (int)
+                Maximum number of characters of the record string values, longer strings are
+                truncated and suffixed with TRUNCATED_MARKER.
+            max_list_items: (int)
+                Maximum number of items of the record list values, longer lists are truncated and
+                TRUNCATED_MARKER is added as last item.
+            max_depth: (int)
+                Maximum nesting depth of the JSON output (the root object has a depth of 1),
+                deeper record dictionaries and lists are replaced by TRUNCATED_MARKER.
+            max_record_size: (int)
+                Maximum size of the UTF-8 encoded output in bytes. When the output is bigger,
+                the values of the drop_priority keys are replaced by TRUNCATED_MARKER, one by one,
+                until the output fits. The output values are encoded once and their sizes summed
+                up before the output is joined (except with indent or sort_keys). With
+                pre_encode, the records are encoded with the pre-encoded fragments and only the
+                records exceeding max_record_size are encoded again value by value.
+            drop_priority: (list)
+                Output keys that can be dropped when the output exceeds max_record_size, in the
+                order they are dropped. Nested output keys are given with a dotted path (e.g.
+                'request.body').
+            level_fmt: (dict)
+                Mapping of level thresholds (level name, number or numeric string) to fmt
+                definitions. The records with a level higher or equal to a threshold are formatted
+                with the fmt of the highest matching threshold, the others with the fmt parameter.
+            logger_fmt: (dict)
+                Mapping of logger names to fmt definitions. The records of these loggers and of
+                their children are formatted with the fmt of the longest matching logger name.
+                This has precedence over level_fmt.
+            fmt_reload_interval: (float)
+                If set, the fmtFile modification time is checked at most once per interval (in
+                seconds) while formatting and the file is reloaded when changed. If the new
+                definition is invalid, a warning is issued and the previous one is kept.
+            memoize_output: (bool)
+                If True, the output of each record (weakly referenced) is memoized by the
+                formatter, so the handlers sharing this formatter format the record only once.
+                NOTE: a handler filter modifying the record after the first formatting doesn't
+                change the memoized output.
+            structured_exc: (bool)
+                If True, the exc_text and stack_info fmt values are output as structured data
+                instead of text: the exception as an object with its type, message, frames
+                (file, line, function and code) and chained exceptions, the stack as a list of
+                frames. NOTE: in this mode the record exc_text is not set.
+            const_attributes: (list)
+                Record attributes having a constant value, e.g. added by the ConstAttribute
+                filter. With pre_encode, the JSON encoding of these attributes is reused as long
+                as the attribute is the same object. NOTE: the constant values must therefore not
+                be modified in place. Only plain attribute names are supported, not dotted keys
+                nor style formats. Without pre_encode, a warning is issued and it is ignored.
             kwargs:
                 Additional parameters passed to json.dumps().
 
         Raises:
             TypeError:  When the fmt parameter is in a wrong type
             json.decoder.JSONDecodeError: When fmt is a string that don't describe a json object
+            ValueError: When a fmt value has an unsupported type, a const_attributes name is
+                not a plain attribute name or fmt_reload_interval is given without fmtFile
         """
         super().__init__(datefmt=datefmt, style=style)
+        self._style_name = style
 
         fmt_from_file = None
+        fmt_file_stat = None
         if fmtFile is not None:
-            with open(fmtFile, 'r', encoding='utf-8') as file:
-                fmt_from_file = json.load(file, object_pairs_hook=dictionary)
+            fmt_file_stat = fmt_file_version(fmtFile)
+            fmt_from_file = load_fmt_file(fmtFile, dictionary)
 
-        if style == '%':
-            self._style_constructor = partial(
-                _ENHANCED_STYLES[style][0], ignore_missing=ignore_missing
-            )
-        else:
-            self._style_constructor = _ENHANCED_STYLES[style][0]
-        self._use_time = str(fmt).find('asctime') >= 0
+        self._style_constructor = partial(_ENHANCED_STYLES[style][0], ignore_missing=ignore_missing)
+        self._styles = {}
+        self._timestamp = (None, None)
         self.json_fmt = self._parse_fmt(fmt, fmt_from_file)
         self.add_always_extra = add_always_extra
         self.filter_attributes = filter_attributes
+        self.exclude_fmt_attributes = exclude_fmt_attributes
         self.remove_empty = remove_empty
+        self.structured_exc = structured_exc
+        self.const_attributes = frozenset(const_attributes or ())
+        for name in self.const_attributes:
+            # The constant value is looked up directly in the record __dict__, a dotted key
+            # (e.g. request.path) or a style format would be cached with its first record value.
+            if not name.isidentifier():
+                raise ValueError(
+                    'Invalid const_attributes name {!r}: must be a plain record attribute '
+                    'name'.format(name)
+                )
 
         # support for `json.dumps` parameters
         self.kwargs = kwargs
-
+        # When adding all extras, to avoid crash when a log message adds an extra with a non
+        # serializable object, we add a default serializer (see logging_utilities.serializers).
+        default = kwargs.get('default', None)
+        if self.add_always_extra and default is None:
+            default = serialize
+        # The encoder is created once and reused for every record
+        json_kwargs = {key: value for key, value in kwargs.items() if key != 'default'}
+        self.bytes_output = bytes_output
+        if bytes_output:
+            # The output is UTF-8 encoded, there is no need to escape the non ASCII characters
+            json_kwargs.setdefault('ensure_ascii', False)
+        self._encoder = get_json_encoder(encoder, default=default, **json_kwargs)
+
+        # The missing attributes are ignored by the fmt fields and styles of this formatter only
         self.ignore_missing = ignore_missing
-        if ignore_missing:
-            set_log_record_ignore_missing_factory()
+
+        self._exc_cache = None
+        if exc_cache_size > 0:
+            self._exc_cache = ExceptionTextCache(exc_cache_size)
+
+        # The record values are limited while rendering, before being serialized
+        self._limiter = None
+        if max_string_length is not None or max_list_items is not None or max_depth is not None:
+            self._limiter = ValueLimiter(max_string_length, max_list_items, max_depth)
+        self.max_record_size = max_record_size
+        self.drop_priority = drop_priority or []
+
+        self.pre_encode = pre_encode
+        if pre_encode and self._encoder.separators is None:
+            warnings.warn(
+                'pre_encode is not supported with indent or sort_keys, it is ignored', UserWarning
+            )
+            self.pre_encode = False
+        if self.const_attributes and not self.pre_encode:
+            warnings.warn(
+                'const_attributes has no effect without pre_encode, it is ignored', UserWarning
+            )
+            self.const_attributes = frozenset()
+
+        # The compiled fmt definitions are shared by all formatters with the same options (see
+        # compile_cache.PLAN_CACHE), these options must therefore be hashable. The formatter class
+        # is part of the options as a subclass can change the compilation.
+        self._plan_options = (
+            type(self),
+            style,
+            remove_empty,
+            ignore_missing,
+            exclude_fmt_attributes,
+            tuple(filter_attributes or ()),
+            (max_string_length, max_list_items, max_depth),
+            structured_exc,
+            self.const_attributes,
+            (encoder, default, tuple(sorted(json_kwargs.items()))) if self.pre_encode else None,
+        )
+        try:
+            hash(self._plan_options)
+        except TypeError:
+            self._plan_options = None
+
+        # The fmt definitions are compiled once, this way the record formatting don't need to
+        # analyze the fmt values again and again.
+        self._plan = self._compile_plan(self.json_fmt)
+        self._level_plans = sorted([
+            (self._get_levelno(level), self._compile_plan(self._parse_fmt(value, None)))
+            for level, value in (level_fmt or {}).items()
+        ],
+                                   key=lambda item: item[0],
+                                   reverse=True)
+        self._logger_plans = sorted([(name, self._compile_plan(self._parse_fmt(value, None)))
+                                     for name, value in (logger_fmt or {}).items()],
+                                    key=lambda item: len(item[0]),
+                                    reverse=True)
+        # The plan selected for a (logger name, level) is cached
+        self._dispatch = None
+        if self._level_plans or self._logger_plans:
+            self._dispatch = {}
+
+        # The memoized outputs are kept by the formatter and not on the record, this way they are
+        # neither output by other formatters nor pickled with the record (e.g. by a
+        # SocketHandler). The outputs are dropped together with their record.
+        self.memoize_output = memoize_output
+        self._memo = weakref.WeakKeyDictionary()
+
+        # The fmtFile reload is checked while formatting, at most once per interval
+        if fmt_reload_interval is not None and fmtFile is None:
+            raise ValueError('fmt_reload_interval requires a fmtFile')
+        self.fmt_reload_interval = fmt_reload_interval
+        self._next_reload_check = None
+        if fmtFile is not None and fmt_reload_interval is not None:
+            self._fmt_file = fmtFile
+            self._fmt_file_stat = fmt_file_stat
+            self._inline_fmt = fmt
+            self._next_reload_check = time.monotonic() + fmt_reload_interval
+
+    def _compile_plan(self, json_fmt):
+        if self._plan_options is None:
+            return self._create_plan(json_fmt)
+        try:
+            key = (fmt_key(json_fmt), self._plan_options)
+        except TypeError:
+            return self._create_plan(json_fmt)
+        return PLAN_CACHE.get(key, partial(self._create_plan, json_fmt))
+
+    def _create_plan(self, json_fmt):
+        # NOTE: the plan is shared between formatters, it must not reference the formatter
+        fields = self._compile_object(json_fmt)
+        fragment = None
+        if self.pre_encode:
+            fragment = _compile_object_fragment(fields, False, self._encoder)
+        # Record attributes that are not logging extra, they are computed once for all records
+        excluded_attrs = set(RECORD_DFT_ATTR)
+        excluded_attrs.update(self.filter_attributes or [])
+        if self.exclude_fmt_attributes:
+            excluded_attrs.update(self._get_fmt_attributes(json_fmt, self._style_name))
+        uses_time = str(json_fmt).find('asctime') >= 0
+        return _FormatPlan(json_fmt, fields, fragment, uses_time, frozenset(excluded_attrs))
+
+    @classmethod
+    def _get_levelno(cls, level):
+        try:
+            return get_levelno(level)
+        except ValueError as err:
+            raise ValueError('Invalid level {!r} in level_fmt: {}'.format(level, err)) from err
+
+    def _get_plan(self, record):
+        if self._next_reload_check is not None and time.monotonic() >= self._next_reload_check:
+            self._reload_fmt_file()
+        # NOTE: the dispatch cache is read before the plan selection, this way a plan selected
+        # during a reload is at worst stored in the previous cache.
+        dispatch = self._dispatch
+        if dispatch is None:
+            return self._plan
+        return self._get_dispatched_plan(dispatch, record)
+
+    def _get_dispatched_plan(self, dispatch, record):
+        key = (record.name, record.levelno)
+        try:
+            return dispatch[key]
+        except KeyError:
+            plan = dispatch[key] = self._select_plan(record.name, record.levelno)
+            return plan
+
+    def _reload_fmt_file(self):
+        # Several threads might check the file at the same time, this is harmless as the plan is
+        # replaced by a single assignment and the hot path never waits on a lock.
+        self._next_reload_check = time.monotonic() + self.fmt_reload_interval
+        try:
+            fmt_file_stat = fmt_file_version(self._fmt_file)
+            if fmt_file_stat == self._fmt_file_stat:
+                return
+            # The version is updated first, so an invalid file is only reported once
+            self._fmt_file_stat = fmt_file_stat
+            json_fmt = self._parse_fmt(self._inline_fmt, load_fmt_file(self._fmt_file, dictionary))
+            plan = self._compile_plan(json_fmt)
+        except (OSError, TypeError, ValueError) as error:
+            warnings.warn(
+                'Failed to reload fmtFile {}, the previous fmt is kept: {}'.format(
+                    self._fmt_file, error
+                ),
+                UserWarning
+            )
+            return
+        self.json_fmt = json_fmt
+        self._plan = plan
+        if self._dispatch is not None:
+            self._dispatch = {}
+
+    def _select_plan(self, name, levelno):
+        for logger_name, plan in self._logger_plans:
+            if name == logger_name or name.startswith(logger_name + '.'):
+                return plan
+        for threshold, plan in self._level_plans:
+            if levelno >= threshold:
+                return plan
+        return self._plan
 
     @classmethod
     def _parse_fmt(cls, fmt, fmt_from_file):
@@ -253,165 +994,297 @@ class JsonFormatter(logging.Formatter):
         for key, value in extra.items():
             message[key] = value
 
-    def _get_extra_attrs(self, record):
-
-        def is_extra_attribute(attr):
-            if attr not in RECORD_DFT_ATTR and (
-                self.filter_attributes is None or attr not in self.filter_attributes
-            ):
-                return True
-            return False
-
-        extras = {key: record.__dict__[key] for key in record.__dict__ if is_extra_attribute(key)}
+    def _get_extra_attrs(self, record, plan):
+        excluded = plan.excluded_attrs
+        extras = {key: value for key, value in record.__dict__.items() if key not in excluded}
         if sys.version_info.major >= 3 and sys.version_info.minor >= 7:
             return extras
         return dictionary((key, extras[key]) for key in sorted(extras.keys()))  # pragma no cover
 
-    def _add_list_to_message(self, record, lst, message):
-        for value in lst:
-            if isinstance(value, (dict, OrderedDict)):
-                intermediate_msg = dictionary()
-                self._add_object_to_message(record, value, intermediate_msg)
-                if not self.remove_empty or len(intermediate_msg) > 0:
-                    message.append(intermediate_msg)
-            elif isinstance(value, list):
-                intermediate_msg = list()
-                self._add_list_to_message(record, value, intermediate_msg)
-                if not self.remove_empty or len(intermediate_msg) > 0:
-                    message.append(intermediate_msg)
-            elif value == 'exc_info':
-                # exc_info might be true or contain exception info. We add it here only a boolean to
-                # know if the message has exception info or not. The info itself will be in
-                # 'exc_text' and is always appended to the json output when not available
-                message.append(bool(record.exc_info))
-            elif value in record.__dict__:
-                intermediate_msg = getattr(record, value, None)
-                if not self.remove_empty or intermediate_msg is not None:
-                    message.append(intermediate_msg)
-            elif isinstance(value, str):
-                intermediate_msg = self._get_string_key_value(record, value)
-                if self.remove_empty and not intermediate_msg:
-                    pass
-                else:
-                    message.append(intermediate_msg)
-            else:
-                raise ValueError(
-                    'Invalid value type={} for value={} in fmt'.format(type(value), value)
-                )  # pragma no cover
-
-    def _add_object_to_message(self, record, obj, message):
-        for key, value in obj.items():
+    @classmethod
+    def _get_fmt_attributes(cls, fmt, style):
+        """Returns the record attributes referenced by the fmt values"""
+        attributes = set()
+        values = list(fmt.values())
+        while values:
+            value = values.pop()
             if isinstance(value, (dict, OrderedDict)):
-                message[key] = dictionary()
-                self._add_object_to_message(record, value, message[key])
-                if self.remove_empty and len(message[key]) == 0:
-                    del message[key]
+                values.extend(value.values())
             elif isinstance(value, list):
-                message[key] = list()
-                self._add_list_to_message(record, value, message[key])
-                if self.remove_empty and len(message[key]) == 0:
-                    del message[key]
-            elif value == 'exc_info':
-                # exc_info might be true or contain exception info. We add it here only a boolean to
-                # know if the message has exception info or not. The info itself will be in
-                # 'exc_text' and is always appended to the json output when not available
-                message[key] = bool(record.exc_info)
-            elif value in record.__dict__:
-                message[key] = getattr(record, value, '')
-                if self.remove_empty and message[key] == '':
-                    del message[key]
+                values.extend(value)
             elif isinstance(value, str):
-                message[key] = self._get_string_key_value(record, value)
-                if self.remove_empty and not message[key]:
-                    del message[key]
-            else:
-                raise ValueError(
-                    'Invalid value type={} for value={} in fmt'.format(type(value), value)
-                )  # pragma no cover
-
-    def _get_dotted_key_value(self, record, str_value):
-        default_value = ''
-        if str_value.endswith('..'):
-            # if the dotted key has two trailing dot, this means that the value must be a list
-            # therefore set the default value to an empty list
-            default_value = []
-        elif str_value.endswith('.'):
-            # if the dotted key has a trailing dot, this mean that the value must be a dict
-            # therefore set the default value to an empty dictionary.
-            default_value = dictionary()
-
-        def get_dotted_key(dct, dotted_key):
-            if not isinstance(dct, (Mapping)):
-                raise ValueError(
-                    'Cannot get dotted key "{}" from "{}": '.format(dotted_key, dct) +
-                    'is not a record or dictionary'
-                )  # pragma: no cover
-            key = dotted_key
-            next_dotted_key = None
-            if '.' in dotted_key:
-                key, next_dotted_key = dotted_key.split('.', maxsplit=1)
-                if next_dotted_key not in ['', '.']:
-                    return get_dotted_key(dct.get(key, dictionary()), next_dotted_key)
-            if self.ignore_missing:
-                return dct.get(key, default_value)
-            try:
-                return dct[key]
-            except KeyError as error:
-                raise ValueError('Key "{}" not found in log record'.format(key)) from error
-
-        return get_dotted_key(record.__dict__, str_value)
+                attributes.add(value)
+                attributes.update(
+                    name.split('.')[0] for name in [value] + _STYLE_FIELDS[style].findall(value)
+                )
+        return attributes
 
-    def _get_string_key_value(self, record, value):
-        style = self._style_constructor(value)
+    def _get_style(self, value):
+        """Returns the style instance for the given fmt value or None if the value is not a valid
+        style format.
 
-        if is_style_format_valid(style):
-            # The value contains a valid style formatting (e.g. %(asctime)s)
-            # therefore use the style formatter.
-            return style.format(record)
+        The result is memoized per fmt value, so the style validation (regex) is done only once
+        per distinct value.
+        """
+        try:
+            return self._styles[value]
+        except KeyError:
+            style = self._style_constructor(value)
+            if not is_style_format_valid(style):
+                style = None
+            self._styles[value] = style
+            return style
+
+    def _compile_object(self, obj, depth=1):
+        # depth is the nesting depth of the object, the root object has a depth of 1
+        fields = []
+        for key, value in obj.items():
+            field = self._compile_value(value, in_list=False, depth=depth + 1)
+            if field is not None:
+                fields.append((key, field))
+        return fields
 
-        # Otherwise try to get a dotted key from the record
-        return self._get_dotted_key_value(record, value)
+    def _compile_list(self, lst, depth):
+        fields = []
+        for value in lst:
+            field = self._compile_value(value, in_list=True, depth=depth + 1)
+            if field is not None:
+                fields.append(field)
+        return fields
+
+    def _compile_value(self, value, in_list, depth):
+        if isinstance(value, (dict, OrderedDict)):
+            return _ObjectField(self._compile_object(value, depth), self.remove_empty)
+        if isinstance(value, list):
+            return _ListField(self._compile_list(value, depth), self.remove_empty)
+        if value == 'exc_info':
+            return _ExcInfoField()
+        if isinstance(value, str):
+            style = self._get_style(value)
+            if style is not None:
+                # The value contains a valid style formatting (e.g. %(asctime)s)
+                # therefore use the style formatter.
+                fallback = _StyleField(style, self.remove_empty)
+            else:
+                # Otherwise try to get a dotted key from the record
+                fallback = _DottedKeyField(value, self.ignore_missing, self.remove_empty)
+            is_empty = None
+            if self.remove_empty:
+                is_empty = _is_none if in_list else _is_empty_string
+            field = attribute_field = _AttributeField(value, fallback, is_empty)
+            if self.structured_exc and value == 'exc_text':
+                field = _StructuredExcField(field)
+            elif self.structured_exc and value == 'stack_info':
+                field = _StructuredStackField(field)
+            if self._limiter is not None:
+                field = _LimitedField(field, self._limiter, depth)
+            if value in self.const_attributes:
+                field = _ConstAttributeField(attribute_field, field)
+            return field
+        if value is None or isinstance(value, (bool, int, float)):
+            if value is None and self.remove_empty:
+                return None
+            return _ConstantField(value)
+        raise ValueError('Invalid value type={} for value={} in fmt'.format(type(value), value))
 
     def usesTime(self):
         """
         Check if the format uses the creation time of the record.
         """
-        return self._use_time
+        return self._plan.uses_time
 
     def formatMessage(self, record):
-        message = dictionary()
-        self._add_object_to_message(record, self.json_fmt, message)
-        return message
+        return _render_object(self._get_plan(record).fields, record)
 
     def format(self, record):
+        if self.memoize_output:
+            return self._format_memoized(record)
+        plan = self._get_plan(record)
+        extra = self._prepare_record(record, plan)
+        return self._encode_record(record, extra, plan)
+
+    def _format_memoized(self, record):
+        try:
+            return self._memo[record]
+        except KeyError:
+            plan = self._get_plan(record)
+            extra = self._prepare_record(record, plan)
+            output = self._memo[record] = self._encode_record(record, extra, plan)
+            return output
+
+    def format_batch(self, records):
+        """Format a batch of records into newline delimited JSON
+
+        The output is the same as joining with a newline the records formatted with `format()`,
+        but the fmtFile reload check and the plan dispatch setup are done once per batch instead
+        of once per record. This is intended to be used by handlers that emit records by batch
+        (e.g. buffered handlers or queue listener).
+
+        Args:
+            records: (iterable)
+                Records to format
+
+        Returns:
+            The records formatted as JSON, one per line (bytes when using bytes_output)
+        """
+        if self._next_reload_check is not None and time.monotonic() >= self._next_reload_check:
+            self._reload_fmt_file()
+        dispatch = self._dispatch
+        memo = self._memo if self.memoize_output else None
+        plan = self._plan
+        outputs = []
+        for record in records:
+            if memo is not None and record in memo:
+                outputs.append(memo[record])
+                continue
+            if dispatch is not None:
+                plan = self._get_dispatched_plan(dispatch, record)
+            output = self._encode_record(record, self._prepare_record(record, plan), plan)
+            if memo is not None:
+                memo[record] = output
+            outputs.append(output)
+        return (b'\n' if self.bytes_output else '\n').join(outputs)
+
+    def formatTime(self, record, datefmt=None):
+        # The date and time is only formatted once per second by the timestamp renderer, it is
+        # recreated when the converter or the formats have been changed.
+        key = (self.converter, datefmt, self.default_time_format, self.default_msec_format)
+        renderer_key, renderer = self._timestamp
+        if renderer_key != key:
+            renderer = StrftimeTimestamp(*key)
+            self._timestamp = (key, renderer)
+        return renderer.render(record.created, record.msecs)
+
+    def _prepare_record(self, record, plan):
+        """Set the computed record attributes and returns the record extra"""
         record.message = record.getMessage()
-        if self.usesTime():
+        if plan.uses_time:
             record.asctime = self.formatTime(record, self.datefmt)
 
+        extra = None
         if self.add_always_extra:
-            extra = self._get_extra_attrs(record)
+            extra = self._get_extra_attrs(record, plan)
+            if self._limiter is not None:
+                extra = {key: self._limiter.limit(value, 2) for key, value in extra.items()}
 
-        if record.exc_info:
+        if record.exc_info and not self.structured_exc:
             # Cache the traceback text to avoid converting it multiple times
             # (it's constant anyway)
             if not record.exc_text:
-                record.exc_text = self.formatException(record.exc_info)
+                if self._exc_cache is None:
+                    record.exc_text = self.formatException(record.exc_info)
+                else:
+                    record.exc_text = self._exc_cache.get(record.exc_info, self.formatException)
 
         if record.stack_info:
             record.stack_info = self.formatStack(record.stack_info)
+        return extra
+
+    def _encode_record(self, record, extra, plan):
+        if plan.fragment is None:
+            if self.max_record_size is not None and self._encoder.separators is not None:
+                return self._encode_within_budget(record, extra, plan)
+            output = self._encode_message(self._get_message(record, extra, plan))
+        else:
+            if extra:
+                output = plan.fragment.get_with_extra(record, extra)
+            else:
+                output = plan.fragment.get(record)
+            if self.bytes_output:
+                output = output.encode('utf-8')
+
+        if self.max_record_size is not None and _utf8_size(output) > self.max_record_size:
+            # With pre_encode, only the records exceeding the budget are encoded again
+            if plan.fragment is not None and self._encoder.separators is not None:
+                return self._encode_within_budget(record, extra, plan)
+            return self._drop_values(record, extra, plan, output)
+        return output
 
-        message = self.formatMessage(record)
+    def _get_message(self, record, extra, plan):
+        # Same as formatMessage() but with the plan already selected for the record
+        message = _render_object(plan.fields, record)
 
         if self.add_always_extra:
             self._add_extra_to_message(extra, message)
+        return message
 
-        # When adding all extras, to avoid crash when a log message adds an extra with a non
-        # serializable object, we add a default serializer.
-        default = self.kwargs.pop('default', None)
-        if self.add_always_extra and default is None:
-            default = str
-
-        return json.dumps(message, default=default, **self.kwargs)
+    def _encode_message(self, message):
+        if self.bytes_output:
+            return self._encoder.encode_bytes(message)
+        return self._encoder.encode(message)
+
+    def _encode_within_budget(self, record, extra, plan):
+        # Each output value is encoded once and its size counted, then the drop_priority values
+        # are replaced by the marker until the output fits, the output is only joined at the end.
+        message = self._get_message(record, extra, plan)
+        encoder = self._encoder
+        item_separator, key_separator = encoder.separators
+        parts = dictionary(
+            (key, _encode_key(encoder, key) + key_separator + encoder.encode_value(value))
+            for key, value in message.items()
+        )
+        sizes = {key: _utf8_size(part) for key, part in parts.items()}
+        size = 2 + sum(sizes.values()) + _utf8_size(item_separator) * max(len(parts) - 1, 0)
+        for drop_key in self.drop_priority:
+            if size <= self.max_record_size:
+                break
+            key = _drop_value(message, drop_key)
+            if key is not None:
+                parts[key] = _encode_key(encoder,
+                                         key) + key_separator + encoder.encode_value(message[key])
+                size += _utf8_size(parts[key]) - sizes[key]
+                sizes[key] = _utf8_size(parts[key])
+        output = '{' + item_separator.join(parts.values()) + '}'
+        if self.bytes_output:
+            return output.encode('utf-8')
+        return output
+
+    def _drop_values(self, record, extra, plan, output):
+        # Fallback when the values cannot be encoded separately (indent or sort_keys), the
+        # message is encoded again after each dropped value.
+        message = self._get_message(record, extra, plan)
+        for drop_key in self.drop_priority:
+            if _drop_value(message, drop_key) is not None:
+                output = self._encode_message(message)
+                if _utf8_size(output) <= self.max_record_size:
+                    break
+        return output
+
+
+def _utf8_size(output):
+    """Returns the size in bytes of the UTF-8 encoded output"""
+    if isinstance(output, bytes) or output.isascii():
+        return len(output)
+    return len(output.encode('utf-8'))
+
+
+def _drop_value(message, drop_key):
+    """Replace the drop_key value of the message by the TRUNCATED_MARKER
+
+    The drop_key is either a key of the message or a dotted key of a nested dictionary value (e.g.
+    `http_request.body`), in this case the dictionaries along the path are copied and not modified.
+
+    Returns:
+        The message key whose value has been replaced or None if the drop_key is not found
+    """
+    if drop_key in message:
+        message[drop_key] = TRUNCATED_MARKER
+        return drop_key
+    key, *path = drop_key.split('.')
+    value = message.get(key)
+    if not path or not isinstance(value, Mapping):
+        return None
+    root = node = dictionary(value)
+    for sub_key in path[:-1]:
+        child = node.get(sub_key)
+        if not isinstance(child, Mapping):
+            return None
+        node[sub_key] = node = dictionary(child)
+    if path[-1] not in node:
+        return None
+    node[path[-1]] = TRUNCATED_MARKER
+    message[key] = root
+    return key
 
 
 def basic_config(**kwargs):  # pragma: no cover
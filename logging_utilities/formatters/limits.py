@@ -0,0 +1,63 @@
+from collections.abc import Mapping
+from itertools import islice
+
+# Marker added to the truncated strings and lists and used as value for the values exceeding the
+# maximum depth or dropped from a too big record.
+TRUNCATED_MARKER = '...[truncated]'
+
+_SCALAR_TYPES = frozenset([int, float, bool, type(None)])
+
+
+class ValueLimiter:
+    '''Limit the size of a value before its serialization
+
+    The value is copied with its strings and lists truncated and its too deep dictionaries and
+    lists replaced by the TRUNCATED_MARKER, this way the parts that exceed the limits are never
+    serialized.
+    '''
+
+    def __init__(self, max_string_length=None, max_list_items=None, max_depth=None):
+        '''Initialize the limiter
+
+        Args:
+            max_string_length: (int)
+                Maximum number of characters of a string, the longer strings are truncated and
+                suffixed with the TRUNCATED_MARKER.
+            max_list_items: (int)
+                Maximum number of items of a list (tuple and set), the longer lists are truncated
+                and the TRUNCATED_MARKER is added as last item.
+            max_depth: (int)
+                Maximum nesting depth, the dictionaries and lists nested deeper are replaced by
+                the TRUNCATED_MARKER.
+        '''
+        self.max_string_length = max_string_length
+        self.max_list_items = max_list_items
+        self.max_depth = max_depth
+
+    def limit(self, value, depth):
+        '''Returns the value within the limits
+
+        Args:
+            value:
+                Value to limit
+            depth: (int)
+                Nesting depth of the value, the values of the root JSON object have a depth of 2
+        '''
+        value_type = type(value)
+        if value_type in _SCALAR_TYPES:
+            return value
+        if value_type is str:
+            if self.max_string_length is not None and len(value) > self.max_string_length:
+                value = value[:self.max_string_length] + TRUNCATED_MARKER
+            return value
+        is_mapping = isinstance(value, (dict, Mapping))
+        if not is_mapping and not isinstance(value, (list, tuple, set, frozenset)):
+            return value
+        if self.max_depth is not None and depth > self.max_depth:
+            return TRUNCATED_MARKER
+        if is_mapping:
+            return {key: self.limit(item, depth + 1) for key, item in value.items()}
+        items = [self.limit(item, depth + 1) for item in islice(value, self.max_list_items)]
+        if self.max_list_items is not None and len(value) > self.max_list_items:
+            items.append(TRUNCATED_MARKER)
+        return items
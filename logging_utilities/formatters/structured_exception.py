@@ -0,0 +1,133 @@
+import builtins
+import linecache
+import re
+
+# The frames are described by dictionaries cached by (code object, line number), this way the
+# source line of a frame is only looked up once (see linecache) and the same frame dictionary is
+# shared by all the tracebacks going through this line. The cached dictionaries must therefore
+# never be modified. The caches are cleared when full, the code objects of a long running
+# application being a bounded set in practice.
+_FRAME_CACHE_SIZE = 4096
+_FRAME_CACHE = {}
+_STACK_CACHE_SIZE = 256
+_STACK_CACHE = {}
+
+_EXCEPTION_GROUP = getattr(builtins, 'BaseExceptionGroup', ())  # pylint: disable=invalid-name
+
+_STACK_FRAME = re.compile(r'^  File "(?P<file>.*)", line (?P<line>\d+), in (?P<function>.*)$')
+
+
+def _get_frame(code, lineno):
+    key = (code, lineno)
+    try:
+        return _FRAME_CACHE[key]
+    except KeyError:
+        pass
+    frame = {
+        'file': code.co_filename,
+        'line': lineno,
+        'function': code.co_name,
+        'code': linecache.getline(code.co_filename, lineno).strip(),
+    }
+    if len(_FRAME_CACHE) >= _FRAME_CACHE_SIZE:
+        _FRAME_CACHE.clear()
+    _FRAME_CACHE[key] = frame
+    return frame
+
+
+def _get_type_name(exc_type):
+    module = exc_type.__module__
+    if module in ('builtins', '__main__'):
+        return exc_type.__qualname__
+    return '{}.{}'.format(module, exc_type.__qualname__)
+
+
+def _get_message(exc_value):
+    try:
+        return str(exc_value)
+    except Exception:  # pylint: disable=broad-except
+        return '<exception str() failed>'
+
+
+def structure_exception(exc_value, seen=None):
+    '''Returns the exception as a JSON serializable dictionary
+
+    The dictionary has the following keys:
+        type:       exception type name (prefixed by its module when not a builtin)
+        message:    exception message
+        frames:     list of traceback frames, each one with its file, line, function and code
+        notes:      exception notes (only if the exception has notes)
+        exceptions: sub exceptions of an exception group (only for exception groups)
+        cause:      structured exception cause (only if the exception has a cause)
+        context:    structured exception context (only if the exception has a context that is
+                    not suppressed)
+
+    Args:
+        exc_value: (BaseException)
+            Exception to structure
+        seen: (set)
+            Ids of the exceptions already structured, used internally to avoid infinite
+            recursion on chained exception cycles
+
+    Returns:
+        The structured exception
+    '''
+    if seen is None:
+        seen = set()
+    seen.add(id(exc_value))
+    frames = []
+    exc_tb = exc_value.__traceback__
+    while exc_tb is not None:
+        frames.append(_get_frame(exc_tb.tb_frame.f_code, exc_tb.tb_lineno))
+        exc_tb = exc_tb.tb_next
+    structure = {
+        'type': _get_type_name(type(exc_value)),
+        'message': _get_message(exc_value),
+        'frames': frames,
+    }
+    notes = getattr(exc_value, '__notes__', None)
+    if notes:
+        structure['notes'] = [_get_message(note) for note in notes]
+    if isinstance(exc_value, _EXCEPTION_GROUP):
+        structure['exceptions'] = [
+            structure_exception(exc, seen) for exc in exc_value.exceptions if id(exc) not in seen
+        ]
+    if exc_value.__cause__ is not None:
+        if id(exc_value.__cause__) not in seen:
+            structure['cause'] = structure_exception(exc_value.__cause__, seen)
+    elif exc_value.__context__ is not None and not exc_value.__suppress_context__:
+        if id(exc_value.__context__) not in seen:
+            structure['context'] = structure_exception(exc_value.__context__, seen)
+    return structure
+
+
+def structure_stack(stack_info):
+    '''Returns the stack information text as a list of frames
+
+    Args:
+        stack_info: (string)
+            Stack information as formatted by the logging module (see LogRecord.stack_info)
+
+    Returns:
+        List of frames, each one with its file, line, function and code
+    '''
+    try:
+        return _STACK_CACHE[stack_info]
+    except KeyError:
+        pass
+    frames = []
+    for line in stack_info.splitlines():
+        match = _STACK_FRAME.match(line)
+        if match:
+            frames.append({
+                'file': match.group('file'),
+                'line': int(match.group('line')),
+                'function': match.group('function'),
+                'code': '',
+            })
+        elif frames and line.startswith('    '):
+            frames[-1]['code'] = line.strip()
+    if len(_STACK_CACHE) >= _STACK_CACHE_SIZE:
+        _STACK_CACHE.clear()
+    _STACK_CACHE[stack_info] = frames
+    return frames
@@ -0,0 +1,78 @@
+import logging
+
+
+class _BinaryWriterMixin:
+    '''Writes the formatted records as bytes into the handler stream
+
+    String records are encoded to UTF-8. The stream can be either a text stream with a binary
+    `buffer` attribute (e.g. sys.stdout) or a binary stream.
+    '''
+    terminator = b'\n'
+
+    def _write_record(self, record):
+        try:
+            msg = self.format(record)
+            if isinstance(msg, str):
+                msg = msg.encode('utf-8')
+            stream = self.stream
+            buffer = getattr(stream, 'buffer', None)
+            if buffer is None:
+                stream.write(msg + self.terminator)
+            else:
+                # Flush the pending text (e.g. print()) to keep the output order
+                stream.flush()
+                buffer.write(msg + self.terminator)
+            self.flush()
+        except RecursionError:  # See issue 36272
+            raise
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+
+
+class BinaryStreamHandler(_BinaryWriterMixin, logging.StreamHandler):
+    '''Logging binary stream handler
+
+    This handler writes the formatted records as bytes directly into the binary buffer of the
+    stream, without going through the stream text encoding layer. It is meant to be used with a
+    formatter returning bytes (e.g. JsonFormatter with bytes_output=True); string records
+    are encoded to UTF-8.
+
+    The stream can be either a text stream with a binary `buffer` attribute (e.g. sys.stdout) or a
+    binary stream, by default sys.stderr is used.
+    '''
+
+    def emit(self, record):
+        self._write_record(record)
+
+
+class BinaryFileHandler(_BinaryWriterMixin, logging.FileHandler):
+    '''Logging binary file handler
+
+    This handler writes the formatted records as bytes into a file opened in binary mode. It is
+    meant to be used with a formatter returning bytes (e.g. JsonFormatter with
+    bytes_output=True); string records are encoded to UTF-8.
+    '''
+
+    def __init__(self, filename, mode='ab', delay=False):
+        '''Initialize the handler
+
+        Args:
+            filename: (string)
+                File path
+            mode: (string)
+                File open mode, the file is always opened in binary mode
+            delay: (bool)
+                If True the file is only opened on the first record emitted
+        '''
+        if 'b' not in mode:
+            mode += 'b'
+        super().__init__(filename, mode=mode, encoding=None, delay=delay)
+
+    def emit(self, record):
+        # Like logging.FileHandler, the file is opened on the first record when delayed but a
+        # closed handler doesn't open it again in write mode, it would truncate the log.
+        if self.stream is None:
+            if not self.mode.startswith('w') or not getattr(self, '_closed', False):
+                self.stream = self._open()
+        if self.stream:
+            self._write_record(record)
@@ -0,0 +1,30 @@
+import logging
+
+
+def get_levelno(level):
+    '''Returns the level number of a logging level
+
+    Args:
+        level: (int, string)
+            Level number, level name (e.g. 'WARNING') or level number as string (e.g. '30' from a
+            JSON or INI configuration file where the keys are always strings)
+
+    Returns:
+        The level number
+
+    Raises:
+        ValueError: When the level type is not supported or the level is not defined
+    '''
+    if not isinstance(level, (str, int)):
+        raise ValueError('Unsupported level type: must be int or string')
+    if isinstance(level, str) and level.isdigit():
+        level = int(level)
+    if isinstance(level, str):
+        # translate level to int
+        levelno = logging.getLevelName(level)
+        if not isinstance(levelno, int):
+            raise ValueError('Unsupported level string')
+        return levelno
+    if logging.getLevelName(level) == "Level %d" % (level):
+        raise ValueError('Undefined level integer')
+    return level
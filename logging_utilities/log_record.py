@@ -2,17 +2,18 @@ from logging import LogRecord
 from logging import getLogRecordFactory
 from logging import setLogRecordFactory
 
+from logging_utilities.context import init_logging_context
+
 _dict_ignore_missing_types = {}
 
 
 class _DictIgnoreMissing(dict):
     _dft_value = ''
 
-    def __getitem__(self, __k):
-        try:
-            return super().__getitem__(__k)
-        except KeyError:
-            return self._dft_value
+    def __missing__(self, key):
+        # Only called by dict.__getitem__() for missing keys, the existing keys are looked up at
+        # the plain dict speed.
+        return self._dft_value
 
 
 def get_or_create_dict_ignore_missing_type(dft_value):
@@ -46,6 +47,9 @@ class LogRecordIgnoreMissing(LogRecord):
     def __init__(self, *args, **kwargs):
         __dft_value = kwargs.pop('__dft_value', '')
         super().__init__(*args, **kwargs)
+        # NOTE: the attributes are copied once the record is initialized on purpose, assigning
+        # the dictionary before the initialization is slower on recent python versions as the
+        # attribute assignments are then no longer optimized (see benchmarks/log_record.py).
         self.__dict__ = get_or_create_dict_ignore_missing_type(__dft_value)(self.__dict__)
 
 
@@ -54,15 +58,88 @@ def set_log_record_ignore_missing_factory(dft_value=''):
     rather to return the `dft_value` instead.
     '''
     original_factory = getLogRecordFactory()
+    dict_type = get_or_create_dict_ignore_missing_type(dft_value)
 
     def record_factory(*args, **kwargs):
         record = original_factory(*args, **kwargs)
-        record.__dict__ = get_or_create_dict_ignore_missing_type(dft_value)(record.__dict__)
+        record.__dict__ = dict_type(record.__dict__)
         return record
 
     setLogRecordFactory(record_factory)
 
 
+def compose_log_record_factory(
+    base_factory=None,
+    context=None,
+    constants=None,
+    ignore_missing=False,
+    dft_value='',
+    logging_context=False
+):
+    '''Returns a log record factory composing the context, constants and ignore missing features
+
+    This is an alternative to chaining `set_logging_context()`,
+    `set_log_record_ignore_missing_factory()` and `ConstAttribute` filters; the features are
+    applied by a single factory with one record attributes update and in an explicit order:
+    the record is created by the base factory, then the constants and the context are added
+    and finally the missing attributes are ignored.
+
+    Usage:
+
+        logging.setLogRecordFactory(compose_log_record_factory(
+            logging_context=True, constants={'service': 'my-service'}, ignore_missing=True
+        ))
+        get_logging_context()['request_id'] = 'abc'
+
+    Args:
+        base_factory: (callable)
+            Factory creating the records, by default the current log record factory
+        context: (Mapping)
+            Context set to the record `context` attribute (e.g. a ThreadMappingContext). With
+            logging_context, the initial content of the logging context instead.
+        constants: (dict)
+            Constant attributes added to every record
+        ignore_missing: (bool)
+            If True, missing attributes accessed via the record `__dict__` return `dft_value`
+            instead of raising an exception (see LogRecordIgnoreMissing)
+        dft_value:
+            Value of the missing attributes when using ignore_missing
+        logging_context: (bool)
+            If True, the record `context` attribute is the logging context managed by
+            `logging_utilities.context` (created if not yet set and initialized with `context`,
+            see `init_logging_context()`), it can then be retrieved with `get_logging_context()`
+            like with `set_logging_context()`.
+
+    Returns:
+        The log record factory
+    '''
+    if base_factory is None:
+        base_factory = getLogRecordFactory()
+    attributes = dict(constants or {})
+    if logging_context:
+        context = init_logging_context(context)
+    if context is not None:
+        attributes['context'] = context
+
+    if ignore_missing:
+        dict_type = get_or_create_dict_ignore_missing_type(dft_value)
+
+        def record_factory(*args, **kwargs):
+            record = base_factory(*args, **kwargs)
+            record.__dict__ = dict_type(record.__dict__, **attributes)
+            return record
+    elif attributes:
+
+        def record_factory(*args, **kwargs):
+            record = base_factory(*args, **kwargs)
+            record.__dict__.update(attributes)
+            return record
+    else:
+        record_factory = base_factory
+
+    return record_factory
+
+
 def reset_log_record_factory():
     '''Reset the log record factory to the original one LogRecord.
 
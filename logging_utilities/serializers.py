@@ -0,0 +1,109 @@
+import dataclasses
+import datetime
+import decimal
+import enum
+import ipaddress
+import pathlib
+import threading
+import uuid
+
+# Registry of the JSON serializers for non JSON types. The serializers are resolved using the
+# type MRO, so a serializer registered for a base class is also used for its subclasses. The
+# resolution is cached per type, this way repeated values of the same class only cost a dict
+# lookup.
+
+_SERIALIZERS = {}
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _decode_bytes(value):
+    return bytes(value).decode('utf-8', errors='backslashreplace')
+
+
+def _enum_value(value):
+    return value.value
+
+
+def register_serializer(types, serializer):
+    '''Register a JSON serializer for the given types
+
+    Args:
+        types: (type|tuple)
+            Type or tuple of types to serialize, subclasses are also serialized unless they have
+            their own serializer
+        serializer: (callable)
+            Function converting a value of this type to a JSON serializable value. The returned
+            value can be again a non JSON type that will then also be serialized.
+    '''
+    if isinstance(types, type):
+        types = (types,)
+    with _LOCK:
+        for cls in types:
+            _SERIALIZERS[cls] = serializer
+        _CACHE.clear()
+
+
+def get_serializer(cls):
+    '''Returns the JSON serializer for the given type
+
+    Args:
+        cls: (type)
+            Type of the value to serialize
+
+    Returns:
+        The serializer or None if no serializer is registered for this type
+    '''
+    try:
+        return _CACHE[cls]
+    except KeyError:
+        pass
+    serializer = None
+    for base in cls.__mro__:
+        if base in _SERIALIZERS:
+            serializer = _SERIALIZERS[base]
+            break
+    else:
+        if dataclasses.is_dataclass(cls):
+            serializer = dataclasses.asdict
+    _CACHE[cls] = serializer
+    return serializer
+
+
+def serialize(value):
+    '''Serialize a non JSON value
+
+    This function can be used as `default` parameter of `json.dumps()`. Values without registered
+    serializer are converted to string.
+
+    Args:
+        value:
+            Value to serialize
+
+    Returns:
+        JSON serializable value
+    '''
+    serializer = get_serializer(type(value))
+    if serializer is None:
+        return str(value)
+    return serializer(value)
+
+
+_IP_TYPES = (
+    ipaddress.IPv4Address,
+    ipaddress.IPv6Address,
+    ipaddress.IPv4Network,
+    ipaddress.IPv6Network,
+    ipaddress.IPv4Interface,
+    ipaddress.IPv6Interface,
+)
+
+register_serializer((datetime.datetime, datetime.date, datetime.time), _isoformat)
+register_serializer((uuid.UUID, decimal.Decimal, pathlib.PurePath) + _IP_TYPES, str)
+register_serializer(enum.Enum, _enum_value)
+register_serializer((bytes, bytearray), _decode_bytes)
+register_serializer((set, frozenset), list)
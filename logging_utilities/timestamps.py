@@ -0,0 +1,110 @@
+import math
+import time
+from datetime import datetime
+from datetime import timezone
+
+# The timestamp renderers cache the formatted date and time of the current second, only the
+# sub second part is formatted for each record. The cache is a single (second, prefix, suffix)
+# tuple that is replaced atomically, so the renderers can be shared between threads. The cache
+# is keyed by the second itself, therefore a daylight saving time change, which always happens on
+# a second boundary, is taken into account.
+
+
+class StrftimeTimestamp:
+    '''Timestamp renderer equivalent to logging.Formatter.formatTime()'''
+
+    def __init__(
+        self,
+        converter=time.localtime,
+        datefmt=None,
+        default_time_format='%Y-%m-%d %H:%M:%S',
+        default_msec_format='%s,%03d'
+    ):
+        '''Initialize the renderer
+
+        Args:
+            converter: (callable)
+                Function converting a timestamp to a time.struct_time, see
+                logging.Formatter.converter
+            datefmt: (string)
+                time.strftime() format, when given the milliseconds are not added
+            default_time_format: (string)
+                time.strftime() format used when datefmt is None
+            default_msec_format: (string)
+                Format used to add the milliseconds to the default_time_format output
+        '''
+        self.converter = converter
+        self.datefmt = datefmt
+        self.default_time_format = default_time_format
+        self.default_msec_format = default_msec_format
+        self._cache = (None, None)
+
+    def render(self, created, msecs):
+        '''Returns the formatted timestamp
+
+        Args:
+            created: (float)
+                Timestamp (see LogRecord.created)
+            msecs: (float)
+                Milliseconds of the timestamp (see LogRecord.msecs)
+        '''
+        second = math.floor(created)
+        cached_second, formatted = self._cache
+        if cached_second != second:
+            formatted = time.strftime(
+                self.datefmt or self.default_time_format, self.converter(created)
+            )
+            self._cache = (second, formatted)
+        if self.datefmt or not self.default_msec_format:
+            return formatted
+        return self.default_msec_format % (formatted, msecs)
+
+
+class IsoTimestamp:
+    '''Timestamp renderer in ISO 8601 format with timezone
+
+    The output is the same as `datetime.fromtimestamp(created).astimezone().isoformat()` for local
+    time or `datetime.fromtimestamp(created, tz=timezone.utc).isoformat()` for UTC where the
+    `+00:00` offset is replaced by `Z`.
+    '''
+
+    def __init__(self, utc=False):
+        '''Initialize the renderer
+
+        Args:
+            utc: (bool)
+                Render the UTC time instead of the local time
+        '''
+        self.utc = utc
+        self._cache = (None, None, None)
+
+    def _format_second(self, second):
+        if self.utc:
+            return datetime.fromtimestamp(second, tz=timezone.utc).isoformat()[:19], 'Z'
+        isotime = datetime.fromtimestamp(second).astimezone().isoformat()
+        return isotime[:19], isotime[19:]
+
+    def render(self, created):
+        '''Returns the formatted timestamp
+
+        Args:
+            created: (float)
+                Timestamp (see LogRecord.created)
+        '''
+        # The microseconds are rounded like datetime.fromtimestamp() does
+        fraction, second = math.modf(created)
+        microsecond = round(fraction * 1e6)
+        if microsecond >= 1000000:
+            second += 1
+            microsecond -= 1000000
+        elif microsecond < 0:
+            second -= 1
+            microsecond += 1000000
+        second = int(second)
+        cached_second, prefix, suffix = self._cache
+        if cached_second != second:
+            prefix, suffix = self._format_second(second)
+            self._cache = (second, prefix, suffix)
+        if microsecond:
+            return '%s.%06d%s' % (prefix, microsecond, suffix)
+        return prefix + suffix
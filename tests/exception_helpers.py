@@ -0,0 +1,39 @@
+import sys
+
+
+class CustomError(Exception):
+    pass
+
+
+def raise_error(message):
+    raise ValueError(message)
+
+
+def raise_chained_error(message):
+    try:
+        raise_error(message)
+    except ValueError as err:
+        raise CustomError('chained') from err
+
+
+def raise_context_error(message):
+    try:
+        raise_error(message)
+    except ValueError:
+        raise KeyError('context')  # pylint: disable=raise-missing-from
+
+
+def get_exception(func, *args):
+    try:
+        func(*args)
+    except Exception as err:  # pylint: disable=broad-except
+        return err
+    return None  # pragma: no cover
+
+
+def get_exc_info(func, *args):
+    try:
+        func(*args)
+    except Exception:  # pylint: disable=broad-except
+        return sys.exc_info()
+    return None  # pragma: no cover
@@ -0,0 +1,165 @@
+import json
+import logging
+import os
+import tempfile
+import time
+import unittest
+import warnings
+from collections import OrderedDict
+from unittest.mock import patch
+
+from logging_utilities.formatters import compile_cache
+from logging_utilities.formatters.compile_cache import CompileCache
+from logging_utilities.formatters.compile_cache import clear_compile_caches
+from logging_utilities.formatters.compile_cache import load_fmt_file
+from logging_utilities.formatters.json_formatter import JsonFormatter
+
+
+class CompileCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        clear_compile_caches()
+
+    def test_lru(self):
+        cache = CompileCache(2)
+        calls = []
+
+        def create(key):
+            calls.append(key)
+            return key.upper()
+
+        for key in ['a', 'a', 'b', 'a', 'c', 'a', 'b']:
+            self.assertEqual(cache.get(key, lambda key=key: create(key)), key.upper())
+        # 'b' has been evicted by 'c'
+        self.assertEqual(calls, ['a', 'b', 'c', 'b'])
+        self.assertEqual(len(cache), 2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_load_fmt_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'fmt.json')
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump({'level': 'levelname'}, file)
+            fmt = load_fmt_file(path, OrderedDict)
+            self.assertEqual(fmt, {'level': 'levelname'})
+            with patch('builtins.open', side_effect=AssertionError('file read again')):
+                self.assertIs(load_fmt_file(path, OrderedDict), fmt)
+
+            # A modified file is read again
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump({'level': 'levelname', 'message': 'message'}, file)
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+            self.assertEqual(
+                load_fmt_file(path, OrderedDict), {
+                    'level': 'levelname', 'message': 'message'
+                }
+            )
+
+    def test_shared_plan(self):
+        fmt = OrderedDict([('level', 'levelname'), ('message', 'message')])
+        formatter1 = JsonFormatter(fmt, remove_empty=True)
+        formatter2 = JsonFormatter(dict(fmt), remove_empty=True)
+        formatter3 = JsonFormatter(fmt)
+        self.assertIs(formatter1._plan, formatter2._plan)  # pylint: disable=protected-access
+        self.assertIsNot(formatter1._plan, formatter3._plan)  # pylint: disable=protected-access
+
+        record = logging.LogRecord('test', logging.INFO, __file__, 10, 'Hello %s', ('world',), None)
+        self.assertEqual(formatter1.format(record), formatter2.format(record))
+
+    def test_subclass_plan(self):
+
+        class ConstantLevelFormatter(JsonFormatter):
+
+            def _compile_value(self, value, in_list, depth):
+                if value == 'levelname':
+                    value = 0
+                return super()._compile_value(value, in_list, depth)
+
+        fmt = {'level': 'levelname', 'message': 'message'}
+        formatter = JsonFormatter(fmt)
+        sub_formatter = ConstantLevelFormatter(fmt)
+        self.assertIsNot(formatter._plan, sub_formatter._plan)  # pylint: disable=protected-access
+        record = logging.LogRecord('test', logging.INFO, __file__, 10, 'Hello', None, None)
+        self.assertEqual(formatter.format(record), '{"level": "INFO", "message": "Hello"}')
+        self.assertEqual(sub_formatter.format(record), '{"level": 0, "message": "Hello"}')
+
+    def test_unhashable_options(self):
+        fmt = {'level': 'levelname', 'message': 'message'}
+        formatter = JsonFormatter(fmt, pre_encode=True, separators=[', ', ': '])
+        record = logging.LogRecord('test', logging.INFO, __file__, 10, 'Hello', None, None)
+        self.assertEqual(formatter.format(record), '{"level": "INFO", "message": "Hello"}')
+        self.assertEqual(len(compile_cache.PLAN_CACHE), 0)
+
+
+class FmtFileReloadTest(unittest.TestCase):
+
+    def setUp(self):
+        clear_compile_caches()
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.directory.name, 'fmt.json')
+        self.mtime_ns = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_fmt(self, content):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        # Make sure the modification time changes even on file systems with low resolution
+        self.mtime_ns += 1000000000
+        os.utime(self.path, ns=(self.mtime_ns, self.mtime_ns))
+
+    def test_reload(self):
+        self.write_fmt('{"level": "levelname"}')
+        formatter = JsonFormatter(
+            fmtFile=self.path, fmt={'message': 'message'}, fmt_reload_interval=60
+        )
+        record = logging.LogRecord('test', logging.INFO, __file__, 10, 'Hello', None, None)
+        self.assertEqual(formatter.format(record), '{"level": "INFO", "message": "Hello"}')
+
+        self.write_fmt('{"logger": "name", "level": "levelname"}')
+        # The file is not checked before the interval
+        self.assertEqual(formatter.format(record), '{"level": "INFO", "message": "Hello"}')
+        with patch(
+            'logging_utilities.formatters.json_formatter.time.monotonic',
+            return_value=time.monotonic() + 61
+        ):
+            self.assertEqual(
+                formatter.format(record), '{"logger": "test", "level": "INFO", "message": "Hello"}'
+            )
+
+    def test_reload_invalid_file(self):
+        self.write_fmt('{"level": "levelname"}')
+        formatter = JsonFormatter(fmtFile=self.path, fmt_reload_interval=0)
+        record = logging.LogRecord('test', logging.INFO, __file__, 10, 'Hello', None, None)
+
+        self.write_fmt('{"level": ')
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            for _ in range(3):
+                self.assertEqual(formatter.format(record), '{"level": "INFO"}')
+        self.assertEqual(len(caught), 1)
+        self.assertIn('previous fmt is kept', str(caught[0].message))
+
+        self.write_fmt('{"message": "message"}')
+        self.assertEqual(formatter.format(record), '{"message": "Hello"}')
+
+    def test_reload_without_fmt_file(self):
+        with self.assertRaises(ValueError):
+            JsonFormatter(fmt={'message': 'message'}, fmt_reload_interval=10)
+
+    def test_reload_dispatch(self):
+        self.write_fmt('{"level": "levelname"}')
+        formatter = JsonFormatter(
+            fmtFile=self.path, fmt_reload_interval=0, level_fmt={'ERROR': {
+                'error': 'message'
+            }}
+        )
+        info = logging.LogRecord('test', logging.INFO, __file__, 10, 'Hello', None, None)
+        error = logging.LogRecord('test', logging.ERROR, __file__, 10, 'Failed', None, None)
+        self.assertEqual(formatter.format(info), '{"level": "INFO"}')
+        self.write_fmt('{"message": "message"}')
+        self.assertEqual(formatter.format(info), '{"message": "Hello"}')
+        self.assertEqual(formatter.format(error), '{"error": "Failed"}')
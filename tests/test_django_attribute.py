@@ -1,7 +1,11 @@
+import datetime
+import enum
 import json
 import logging
 import sys
 import unittest
+import uuid
+import warnings
 from collections import OrderedDict
 
 from django.conf import settings
@@ -9,6 +13,7 @@ from django.test import RequestFactory
 
 from logging_utilities.filters.django_request import JsonDjangoRequest
 from logging_utilities.formatters.json_formatter import JsonFormatter
+from logging_utilities.serializers import register_serializer
 
 # From python3.7, dict is ordered
 if sys.version_info.major >= 3 and sys.version_info.minor >= 7:
@@ -184,3 +189,43 @@ class RecordDjangoAttributesTest(unittest.TestCase):
         for i, request in enumerate(requests):
             message = json.loads(ctx.output[i], object_pairs_hook=dictionary)
             self.assertEqual(request, message['request'])
+
+    def test_django_request_jsonify_serializers(self):
+        request = self.factory.get('/my/path')
+        request.timestamp = datetime.datetime(2020, 1, 2, 3, 4, 5)
+        request.id = uuid.UUID(int=1)
+        django_filter = JsonDjangoRequest(include_keys=['request.timestamp', 'request.id'])
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            # pylint: disable=protected-access
+            jsonified = django_filter._jsonify_dict('request', request.__dict__)
+        self.assertEqual(
+            jsonified, {
+                'timestamp': '2020-01-02T03:04:05', 'id': '00000000-0000-0000-0000-000000000001'
+            }
+        )
+
+    def test_django_request_jsonify_registered_serializers(self):
+
+        class Color(enum.Enum):
+            RED = 'red'
+
+        class Point:
+
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+
+        register_serializer(Point, lambda point: '{},{}'.format(point.x, point.y))
+        request = self.factory.get('/my/path')
+        request.color = Color.RED
+        request.point = Point(1, 2)
+        request.data = b'abc'
+        django_filter = JsonDjangoRequest(
+            include_keys=['request.color', 'request.point', 'request.data']
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            # pylint: disable=protected-access
+            jsonified = django_filter._jsonify_dict('request', request.__dict__)
+        self.assertEqual(jsonified, {'color': 'red', 'point': '1,2', 'data': 'abc'})
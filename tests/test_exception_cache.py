@@ -0,0 +1,77 @@
+import logging
+import unittest
+from unittest.mock import patch
+
+from logging_utilities.formatters.exception_cache import ExceptionTextCache
+from logging_utilities.formatters.exception_cache import exception_fingerprint
+from logging_utilities.formatters.json_formatter import JsonFormatter
+
+from tests.exception_helpers import get_exc_info
+from tests.exception_helpers import raise_chained_error
+from tests.exception_helpers import raise_error
+
+
+class ExceptionFingerprintTest(unittest.TestCase):
+
+    def test_same_exception(self):
+        self.assertEqual(
+            exception_fingerprint(*get_exc_info(raise_error, 'message')),
+            exception_fingerprint(*get_exc_info(raise_error, 'message'))
+        )
+        self.assertEqual(
+            exception_fingerprint(*get_exc_info(raise_chained_error, 'message')),
+            exception_fingerprint(*get_exc_info(raise_chained_error, 'message'))
+        )
+
+    def test_different_exception(self):
+        fingerprints = [
+            exception_fingerprint(*get_exc_info(raise_error, 'message')),
+            exception_fingerprint(*get_exc_info(raise_error, 'other message')),
+            exception_fingerprint(*get_exc_info(raise_chained_error, 'message')),
+            exception_fingerprint(*get_exc_info(raise_chained_error, 'other message')),
+            exception_fingerprint(*get_exc_info(lambda: raise_error('message'))),
+        ]
+        self.assertEqual(len(set(fingerprints)), len(fingerprints))
+
+    def test_no_exception(self):
+        self.assertIsNone(exception_fingerprint(None, None, None))
+
+
+class ExceptionTextCacheTest(unittest.TestCase):
+
+    def test_cache(self):
+        cache = ExceptionTextCache(2)
+        calls = []
+
+        def format_exception(exc_info):
+            calls.append(exc_info)
+            return str(exc_info[1])
+
+        for message in ['a', 'a', 'b', 'a', 'c', 'a', 'b']:
+            self.assertEqual(
+                cache.get(get_exc_info(raise_error, message), format_exception), message
+            )
+        # 'b' has been evicted by 'c'
+        self.assertEqual([str(exc_info[1]) for exc_info in calls], ['a', 'b', 'c', 'b'])
+        self.assertEqual(len(cache), 2)
+
+    def test_json_formatter(self):
+        fmt = {'message': 'message', 'exc_info': 'exc_info'}
+        formatter = JsonFormatter(fmt)
+        cache_formatter = JsonFormatter(fmt, exc_cache_size=10)
+        with patch.object(
+            cache_formatter, 'formatException', wraps=cache_formatter.formatException
+        ) as format_exception:
+            for i in range(3):
+                record = logging.LogRecord(
+                    'test',
+                    logging.ERROR,
+                    __file__,
+                    10,
+                    'Error %d', (i,),
+                    get_exc_info(raise_chained_error, 'message')
+                )
+                expected = formatter.format(record)
+                record.exc_text = None
+                self.assertEqual(cache_formatter.format(record), expected)
+        format_exception.assert_called_once()
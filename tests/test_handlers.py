@@ -0,0 +1,95 @@
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from logging_utilities.formatters.json_formatter import JsonFormatter
+from logging_utilities.handlers import BinaryFileHandler
+from logging_utilities.handlers import BinaryStreamHandler
+
+
+class BinaryHandlersTest(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.logger = logging.getLogger('test_binary_handler')
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+
+    def tearDown(self):
+        for handler in self.logger.handlers[:]:
+            self.logger.removeHandler(handler)
+            handler.close()
+        super().tearDown()
+
+    def _add_handler(self, handler, bytes_output=True):
+        handler.setFormatter(
+            JsonFormatter({
+                'level': 'levelname', 'message': 'message'
+            }, bytes_output=bytes_output)
+        )
+        self.logger.addHandler(handler)
+
+    def test_binary_stream_handler_text_stream(self):
+        buffer = io.BytesIO()
+        stream = io.TextIOWrapper(buffer, encoding='utf-8')
+        self._add_handler(BinaryStreamHandler(stream))
+        stream.write('text before\n')
+        self.logger.info('Unicode message é')
+        stream.write('text after\n')
+        stream.flush()
+        self.assertEqual(
+            buffer.getvalue().decode('utf-8'),
+            'text before\n'
+            '{"level": "INFO", "message": "Unicode message é"}\n'
+            'text after\n'
+        )
+
+    def test_binary_stream_handler_binary_stream(self):
+        stream = io.BytesIO()
+        self._add_handler(BinaryStreamHandler(stream))
+        self.logger.info('First message')
+        self.logger.warning('Second message')
+        self.assertEqual(
+            stream.getvalue(),
+            b'{"level": "INFO", "message": "First message"}\n'
+            b'{"level": "WARNING", "message": "Second message"}\n'
+        )
+
+    def test_binary_stream_handler_str_formatter(self):
+        stream = io.BytesIO()
+        self._add_handler(BinaryStreamHandler(stream), bytes_output=False)
+        self.logger.info('Unicode message é')
+        self.assertEqual(
+            stream.getvalue(), b'{"level": "INFO", "message": "Unicode message \\u00e9"}\n'
+        )
+
+    def test_binary_file_handler(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'test.log')
+            self._add_handler(BinaryFileHandler(path, mode='w', delay=True))
+            self.assertFalse(os.path.exists(path))
+            self.logger.info('Unicode message é')
+            self.logger.handlers[0].close()
+            with open(path, 'rb') as file:
+                self.assertEqual(
+                    file.read(),
+                    '{"level": "INFO", "message": "Unicode message é"}\n'.encode('utf-8')
+                )
+
+    def test_binary_file_handler_closed(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for mode, expected in [('w', ['first']), ('a', ['first', 'after close'])]:
+                path = os.path.join(tmp_dir, 'test_{}.log'.format(mode))
+                self._add_handler(BinaryFileHandler(path, mode=mode))
+                self.logger.info('first')
+                self.logger.handlers[0].close()
+                # Like logging.FileHandler, a closed handler doesn't truncate the file
+                self.logger.info('after close')
+                handler = self.logger.handlers[0]
+                self.logger.removeHandler(handler)
+                handler.close()
+                with open(path, 'rb') as file:
+                    self.assertEqual([json.loads(line)['message'] for line in file], expected)
@@ -0,0 +1,190 @@
+import importlib.util
+import json
+import logging
+import sys
+import unittest
+from collections import OrderedDict
+from unittest.mock import patch
+
+from nose2.tools import params
+
+from logging_utilities.formatters.json_encoders import JsonEncoder
+from logging_utilities.formatters.json_encoders import RawJSON
+from logging_utilities.formatters.json_encoders import get_json_encoder
+from logging_utilities.formatters.json_formatter import JsonFormatter
+
+# From python3.7, dict is ordered
+if sys.version_info.major >= 3 and sys.version_info.minor >= 7:
+    dictionary = dict
+else:
+    dictionary = OrderedDict
+
+ENCODERS = ['json', 'orjson', 'ujson', 'msgspec']
+
+
+def is_installed(name):
+    return importlib.util.find_spec(name) is not None
+
+
+class NotSerializable:
+
+    def __str__(self):
+        return 'not serializable'
+
+
+class JsonEncodersTest(unittest.TestCase):
+
+    @params(*ENCODERS)
+    def test_encoder(self, name):
+        if not is_installed(name):
+            self.skipTest('{} is not installed'.format(name))
+        encoder = get_json_encoder(name)
+        self.assertEqual(encoder.name, name)
+        obj = dictionary([('b', 'é/'), ('a', [1, 2.5, None, True]), ('c', {'d': 'e'})])
+        self.assertEqual(json.loads(encoder.encode(obj)), obj)
+        self.assertEqual(
+            list(json.loads(encoder.encode(obj), object_pairs_hook=dictionary).keys()),
+            ['b', 'a', 'c']
+        )
+
+    @params(*ENCODERS)
+    def test_encoder_default(self, name):
+        if not is_installed(name):
+            self.skipTest('{} is not installed'.format(name))
+        encoder = get_json_encoder(name, default=str)
+        self.assertEqual(
+            json.loads(encoder.encode({'a': NotSerializable()})), {'a': 'not serializable'}
+        )
+
+    @params(*ENCODERS)
+    def test_encoder_sort_keys(self, name):
+        if not is_installed(name):
+            self.skipTest('{} is not installed'.format(name))
+        encoder = get_json_encoder(name, sort_keys=True)
+        self.assertEqual(encoder.name, name)
+        output = encoder.encode(dictionary([('b', 1), ('a', 2)]))
+        self.assertEqual(list(json.loads(output, object_pairs_hook=dictionary)), ['a', 'b'])
+
+    @params(*ENCODERS)
+    def test_encoder_bytes(self, name):
+        if not is_installed(name):
+            self.skipTest('{} is not installed'.format(name))
+        encoder = get_json_encoder(name, ensure_ascii=False)
+        self.assertEqual(encoder.name, name)
+        obj = dictionary([('a', 'é'), ('b', [1, None])])
+        self.assertEqual(encoder.encode_bytes(obj), encoder.encode(obj).encode('utf-8'))
+        self.assertEqual(json.loads(encoder.encode_bytes(obj)), obj)
+
+    @params(*ENCODERS)
+    def test_encoder_raw_json(self, name):
+        if not is_installed(name):
+            self.skipTest('{} is not installed'.format(name))
+        encoder = get_json_encoder(name)
+        self.assertEqual(encoder.name, name)
+        obj = dictionary([
+            ('a', RawJSON('{"b":  [1, 2]}')),
+            ('c', [RawJSON(b'null'), RawJSON('"d"')]),
+        ])
+        output = encoder.encode(obj)
+        self.assertIn('{"b":  [1, 2]}', output)
+        self.assertEqual(json.loads(output), {'a': {'b': [1, 2]}, 'c': [None, 'd']})
+        self.assertEqual(encoder.encode_bytes(obj), output.encode('utf-8'))
+        self.assertEqual(encoder.encode_value(RawJSON('[1]')), '[1]')
+        with self.assertRaises(TypeError):
+            encoder.encode({'a': NotSerializable()})
+
+    @params(
+        ('json', 'NaN', 'Infinity', True),
+        ('orjson', 'null', 'null', False),
+        ('ujson', 'NaN', 'Infinity', True),
+        ('msgspec', 'null', 'null', True),
+    )
+    def test_encoder_differences(self, name, nan, infinity, big_int):
+        # The documented differences of the encoders with the python standard library
+        if not is_installed(name):
+            self.skipTest('{} is not installed'.format(name))
+        encoder = get_json_encoder(name)
+        self.assertEqual(encoder.name, name)
+        self.assertEqual(
+            encoder.encode([float('nan'), float('inf')]).replace(' ', ''),
+            '[{},{}]'.format(nan, infinity)
+        )
+        if big_int:
+            self.assertEqual(encoder.encode([2**70]), '[{}]'.format(2**70))
+        else:
+            with self.assertRaises(TypeError):
+                encoder.encode([2**70])
+
+    def test_unknown_encoder(self):
+        with self.assertRaises(ValueError):
+            get_json_encoder('unknown')
+
+    @params('orjson', 'ujson', 'msgspec')
+    def test_encoder_not_installed(self, name):
+        with patch.dict(sys.modules, {name: None}):
+            with self.assertWarns(UserWarning):
+                encoder = get_json_encoder(name, indent=2)
+        self.assertIsInstance(encoder, JsonEncoder)
+        self.assertEqual(encoder.encode({'a': 1}), '{\n  "a": 1\n}')
+
+    @params(('orjson', 'separators', (',', ':')), ('orjson', 'indent', 4),
+            ('orjson', 'ensure_ascii', True), ('msgspec', 'indent', 2),
+            ('ujson', 'allow_nan', False))
+    def test_encoder_unsupported_kwargs(self, name, key, value):
+        if not is_installed(name):
+            self.skipTest('{} is not installed'.format(name))
+        with self.assertWarns(UserWarning):
+            encoder = get_json_encoder(name, **{key: value})
+        self.assertIsInstance(encoder, JsonEncoder)
+
+    @params(*ENCODERS)
+    def test_json_formatter_default(self, name):
+        if not is_installed(name):
+            self.skipTest('{} is not installed'.format(name))
+        with self.assertLogs('test_formatter', level=logging.DEBUG) as ctx:
+            logger = logging.getLogger('test_formatter')
+            logger.setLevel(logging.DEBUG)
+            for handler in logger.handlers:
+                handler.setFormatter(
+                    JsonFormatter(
+                        dictionary([('message', 'message')]),
+                        add_always_extra=True,
+                        encoder=name,
+                        default=lambda obj: 'custom default'
+                    )
+                )
+            logger.info('First message', extra={'extra': NotSerializable()})
+            logger.info('Second message', extra={'extra': NotSerializable()})
+        for output, message in zip(ctx.output, ['First message', 'Second message']):
+            self.assertDictEqual(
+                json.loads(output, object_pairs_hook=dictionary),
+                dictionary([
+                    ("message", message),
+                    ("extra", "custom default"),
+                ])
+            )
+
+    @params(*ENCODERS)
+    def test_json_formatter_encoder(self, name):
+        if not is_installed(name):
+            self.skipTest('{} is not installed'.format(name))
+        with self.assertLogs('test_formatter', level=logging.DEBUG) as ctx:
+            logger = logging.getLogger('test_formatter')
+            logger.setLevel(logging.DEBUG)
+            for handler in logger.handlers:
+                handler.setFormatter(
+                    JsonFormatter(
+                        dictionary([('level', 'levelname'), ('message', 'message')]),
+                        add_always_extra=True,
+                        encoder=name
+                    )
+                )
+            logger.info('Simple message', extra={'extra': NotSerializable()})
+        self.assertDictEqual(
+            json.loads(ctx.output[0], object_pairs_hook=dictionary),
+            dictionary([
+                ("level", "INFO"),
+                ("message", "Simple message"),
+                ("extra", "not serializable"),
+            ])
+        )
@@ -1,3 +1,4 @@
+# pylint: disable=too-many-lines
 import json
 import logging
 import re
@@ -5,10 +6,13 @@ import sys
 import unittest
 from collections import OrderedDict
 from datetime import datetime
+from unittest.mock import patch
 
 from nose2.tools import params
 
 from logging_utilities.filters import ConstAttribute
+from logging_utilities.formatters.extra_formatter import ExtraFormatter
+from logging_utilities.formatters.json_encoders import RawJSON
 from logging_utilities.formatters.json_formatter import JsonFormatter
 from logging_utilities.formatters.json_formatter import basic_config
 
@@ -22,6 +26,8 @@ else:
 # pylint: disable=too-many-public-methods
 class BasicJsonFormatterTest(unittest.TestCase):
     maxDiff = None
+    # Additional JsonFormatter parameters
+    formatter_kwargs = {}
 
     @classmethod
     def _configure_logger(
@@ -43,7 +49,8 @@ class BasicJsonFormatterTest(unittest.TestCase):
                 add_always_extra=add_always_extra,
                 remove_empty=remove_empty,
                 ignore_missing=ignore_missing,
-                style=style
+                style=style,
+                **cls.formatter_kwargs
             )
             handler.setFormatter(formatter)
 
@@ -62,7 +69,8 @@ class BasicJsonFormatterTest(unittest.TestCase):
                     ('message', 'message'),
                 ]),
                 remove_empty=remove_empty,
-                filter_attributes=['application', 'empty_attr']
+                filter_attributes=['application', 'empty_attr'],
+                **cls.formatter_kwargs
             )
             handler.setFormatter(formatter)
 
@@ -621,6 +629,40 @@ class BasicJsonFormatterTest(unittest.TestCase):
             ])
         )
 
+    @params(
+        ('%', dictionary([('path', 'request.path'), ('user', '%(user)s %(app.name)s')])),
+        ('{', dictionary([('path', 'request.path'), ('user', '{user} {app}')])),
+        ('$', dictionary([('path', 'request.path'), ('user', '${user} $app')])),
+    )
+    def test_extra_exclude_fmt_attributes(self, style, fmt):
+        fmt = dictionary(fmt, level='levelname', message='message')
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Simple message', None, None
+        )
+        record.request = {'path': '/my/path'}
+        record.user = 'user'
+        record.app = {'name': 'app'} if style == '%' else 'app'
+        record.filtered = 'filtered'
+        record.extra = 'extra'
+        formatter = JsonFormatter(
+            fmt,
+            style=style,
+            add_always_extra=True,
+            filter_attributes=['filtered'],
+            exclude_fmt_attributes=True,
+            **self.formatter_kwargs
+        )
+        self.assertDictEqual(
+            json.loads(formatter.format(record), object_pairs_hook=dictionary),
+            dictionary([
+                ('path', '/my/path'),
+                ('user', 'user app'),
+                ('level', 'INFO'),
+                ('message', 'Simple message'),
+                ('extra', 'extra'),
+            ])
+        )
+
     def test_sub_key(self):
         with self.assertLogs('test_formatter', level=logging.DEBUG) as ctx:
             logger = logging.getLogger('test_formatter')
@@ -658,6 +700,48 @@ class BasicJsonFormatterTest(unittest.TestCase):
             ])
         )
 
+    def test_sub_key_deep(self):
+        with self.assertLogs('test_formatter', level=logging.DEBUG) as ctx:
+            logger = logging.getLogger('test_formatter')
+            self._configure_logger(
+                logger,
+                fmt=dictionary([
+                    ('host', 'request.headers.Host'),
+                    ('headers', 'request.headers.'),
+                    ('args', 'request.args..'),
+                    ('message', 'message'),
+                ]),
+                ignore_missing=True
+            )
+            logger.info(
+                'Composed message %s',
+                'with extra request',
+                extra={'request': {
+                    'headers': {
+                        'Host': 'example.com'
+                    }, 'args': ['a']
+                }}
+            )
+            logger.info('Composed message %s', 'without extra request')
+        self.assertDictEqual(
+            json.loads(ctx.output[0], object_pairs_hook=dictionary),
+            dictionary([
+                ("host", "example.com"),
+                ("headers", dictionary([("Host", "example.com")])),
+                ("args", ["a"]),
+                ("message", "Composed message with extra request"),
+            ])
+        )
+        self.assertDictEqual(
+            json.loads(ctx.output[1], object_pairs_hook=dictionary),
+            dictionary([
+                ("host", ""),
+                ("headers", dictionary()),
+                ("args", []),
+                ("message", "Composed message without extra request"),
+            ])
+        )
+
     def test_sub_key_list(self):
         with self.assertLogs('test_formatter', level=logging.DEBUG) as ctx:
             logger = logging.getLogger('test_formatter')
@@ -826,6 +910,21 @@ class BasicJsonFormatterTest(unittest.TestCase):
             ])
         )
 
+    @params(('%', '%(missing)s-%(levelname)s'), ('{', '{missing}-{levelname}'),
+            ('$', '${missing}-${levelname}'))
+    def test_missing_attribute_styles(self, style, value):
+        factory = logging.getLogRecordFactory()
+        formatter = JsonFormatter({'value': value},
+                                  style=style,
+                                  ignore_missing=True,
+                                  **self.formatter_kwargs)
+        # The missing attributes are ignored by the formatter, the record factory is unchanged
+        self.assertIs(logging.getLogRecordFactory(), factory)
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Hello', None, None
+        )
+        self.assertEqual(formatter.format(record), '{"value": "-INFO"}')
+
     def test_exc_info_without_configuration(self):
         """
         Test that the exc_text doesn't appear if it's not configured
@@ -902,6 +1001,452 @@ class BasicJsonFormatterTest(unittest.TestCase):
             ])
         )
 
+    def test_style_dotted_key(self):
+        with self.assertLogs('test_formatter', level=logging.DEBUG) as ctx:
+            logger = logging.getLogger('test_formatter')
+            self._configure_logger(
+                logger,
+                fmt=dictionary([
+                    ('request', '%(request.method)s %(request.path)s'),
+                    ('host', '%(request.headers.Host)s'),
+                    ('missing', '%(request.missing)s'),
+                    ('message', 'message'),
+                ]),
+                ignore_missing=True
+            )
+            logger.info(
+                'Composed message %s',
+                'with extra request',
+                extra={
+                    'request': {
+                        'path': '/my/path', 'method': 'GET', 'headers': {
+                            'Host': 'example.com'
+                        }
+                    }
+                }
+            )
+            logger.info('Composed message %s', 'without extra request')
+        self.assertDictEqual(
+            json.loads(ctx.output[0], object_pairs_hook=dictionary),
+            dictionary([
+                ("request", "GET /my/path"),
+                ("host", "example.com"),
+                ("missing", ""),
+                ("message", "Composed message with extra request"),
+            ])
+        )
+        self.assertDictEqual(
+            json.loads(ctx.output[1], object_pairs_hook=dictionary),
+            dictionary([
+                ("request", " "),
+                ("host", ""),
+                ("missing", ""),
+                ("message", "Composed message without extra request"),
+            ])
+        )
+
+    @params(None, '%Y-%m-%dT%H:%M:%S')
+    def test_format_batch(self, datefmt):
+        fmt = dictionary([('time', 'asctime'), ('level', 'levelname'), ('message', 'message')])
+        formatter = JsonFormatter(fmt, datefmt=datefmt, **self.formatter_kwargs)
+
+        def make_records():
+            records = []
+            for i, created in enumerate([1600000000.001, 1600000000.5, 1600000001.2, 1600000003]):
+                record = logging.LogRecord(
+                    'test_formatter', logging.INFO, __file__, 10, 'message %d', (i,), None
+                )
+                record.created = created
+                record.msecs = (created - int(created)) * 1000
+                records.append(record)
+            return records
+
+        output = formatter.format_batch(make_records())
+        self.assertEqual(output, '\n'.join(map(formatter.format, make_records())))
+        self.assertEqual(len(output.splitlines()), 4)
+        self.assertEqual(formatter.format_batch([]), '')
+
+    def test_format_batch_dispatch(self):
+        formatter = JsonFormatter(
+            dictionary([('level', 'levelname'), ('message', 'message')]),
+            level_fmt={'ERROR': dictionary([('error', 'message')])},
+            memoize_output=True,
+            **self.formatter_kwargs
+        )
+        records = [
+            logging.LogRecord('test_formatter', level, __file__, 10, 'message', None, None)
+            for level in [logging.INFO, logging.ERROR, logging.INFO]
+        ]
+        expected = '{"level": "INFO", "message": "message"}\n{"error": "message"}\n' \
+            '{"level": "INFO", "message": "message"}'
+        with patch.object(formatter, '_get_plan', side_effect=AssertionError('plan per record')):
+            self.assertEqual(formatter.format_batch(records), expected)
+            # Second time from the memoized outputs
+            with patch.object(formatter, '_prepare_record', side_effect=AssertionError('format')):
+                self.assertEqual(formatter.format_batch(records), expected)
+
+    def test_bytes_output(self):
+        fmt = dictionary([('level', 'levelname'), ('message', 'message')])
+        formatter = JsonFormatter(fmt, ensure_ascii=False, **self.formatter_kwargs)
+        bytes_formatter = JsonFormatter(fmt, bytes_output=True, **self.formatter_kwargs)
+        records = [
+            logging.LogRecord(
+                'test_formatter', logging.INFO, __file__, 10, 'Unicode message é %s', (i,), None
+            ) for i in range(3)
+        ]
+        output = bytes_formatter.format(records[0])
+        self.assertIsInstance(output, bytes)
+        self.assertEqual(output, formatter.format(records[0]).encode('utf-8'))
+        self.assertEqual(output, '{"level": "INFO", "message": "Unicode message é 0"}'.encode())
+        self.assertEqual(
+            bytes_formatter.format_batch(records), formatter.format_batch(records).encode('utf-8')
+        )
+
+    def test_memoize_output(self):
+        fmt = dictionary([('level', 'levelname'), ('message', 'message')])
+        formatter = JsonFormatter(fmt, memoize_output=True, **self.formatter_kwargs)
+        other_formatter = JsonFormatter(
+            dictionary([('message', 'message')]), memoize_output=True, **self.formatter_kwargs
+        )
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Hello', None, None
+        )
+        handlers = [logging.NullHandler() for _ in range(3)]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        prepare_record = formatter._prepare_record  # pylint: disable=protected-access
+        with patch.object(formatter, '_prepare_record', wraps=prepare_record) as prepare:
+            outputs = [handler.format(record) for handler in handlers]
+            prepare.assert_called_once()
+        self.assertEqual(outputs, ['{"level": "INFO", "message": "Hello"}'] * 3)
+        self.assertEqual(other_formatter.format(record), '{"message": "Hello"}')
+        self.assertEqual(formatter.format(record), '{"level": "INFO", "message": "Hello"}')
+
+        # The memoized outputs are not added as extra
+        extra_formatter = JsonFormatter(
+            fmt, add_always_extra=True, memoize_output=True, **self.formatter_kwargs
+        )
+        self.assertEqual(extra_formatter.format(record), '{"level": "INFO", "message": "Hello"}')
+        self.assertEqual(
+            JsonFormatter(fmt, add_always_extra=True, **self.formatter_kwargs).format(record),
+            '{"level": "INFO", "message": "Hello"}'
+        )
+
+    def test_memoize_output_extra_collision(self):
+        fmt = dictionary([('message', 'message')])
+        formatter = JsonFormatter(
+            fmt, add_always_extra=True, memoize_output=True, **self.formatter_kwargs
+        )
+        with self.assertLogs('test_formatter', level=logging.DEBUG) as ctx:
+            logger = logging.getLogger('test_formatter')
+            logger.handlers[0].setFormatter(formatter)
+            logger.info('Hello', extra={'formatted_output': 'x'})
+        self.assertEqual(ctx.output, ['{"message": "Hello", "formatted_output": "x"}'])
+
+    def test_memoize_output_record_unchanged(self):
+        formatter = JsonFormatter(
+            dictionary([('message', 'message')]), memoize_output=True, **self.formatter_kwargs
+        )
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Hello', None, None
+        )
+        attributes = set(record.__dict__)
+        self.assertEqual(formatter.format(record), '{"message": "Hello"}')
+        # Only the message is added by the formatting, the memoized output is not on the record
+        self.assertEqual(set(record.__dict__) - attributes, {'message'})
+        self.assertEqual(
+            ExtraFormatter('%(message)s', extra_fmt=' extra=%s').format(record), 'Hello'
+        )
+        self.assertEqual(len(formatter._memo), 1)  # pylint: disable=protected-access
+        del record
+        self.assertEqual(len(formatter._memo), 0)  # pylint: disable=protected-access
+
+    @params(False, True)
+    def test_raw_json(self, add_always_extra):
+        fmt = dictionary([('level', 'levelname'), ('response', 'response'), ('message', 'message')])
+        formatter = JsonFormatter(fmt, add_always_extra=add_always_extra, **self.formatter_kwargs)
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Simple message', None, None
+        )
+        record.response = RawJSON('{"status":  "ok"}')
+        record.payloads = [RawJSON('1'), RawJSON('{}')]
+        output = formatter.format(record)
+        self.assertIn('"response": {"status":  "ok"}', output)
+        expected = dictionary([
+            ('level', 'INFO'),
+            ('response', {
+                'status': 'ok'
+            }),
+            ('message', 'Simple message'),
+        ])
+        if add_always_extra:
+            expected['payloads'] = [1, {}]
+        self.assertDictEqual(json.loads(output, object_pairs_hook=dictionary), expected)
+
+    def test_limits(self):
+        fmt = dictionary([
+            ('level', 'levelname'),
+            ('message', 'message'),
+            ('request', 'request'),
+            ('nested', dictionary([('items', 'items'), ('path', 'request.path')])),
+        ])
+        formatter = JsonFormatter(
+            fmt,
+            add_always_extra=True,
+            exclude_fmt_attributes=True,
+            max_string_length=10,
+            max_list_items=2,
+            max_depth=3,
+            **self.formatter_kwargs
+        )
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Very long message', None, None
+        )
+        record.request = {'path': '/my/very/long/path', 'data': {'deep': {'deeper': 1}}}
+        record.items = [1, [2], 3]
+        record.extra = ('a', 'b', 'c')
+        self.assertDictEqual(
+            json.loads(formatter.format(record), object_pairs_hook=dictionary),
+            dictionary([
+                ('level', 'INFO'),
+                ('message', 'Very long ...[truncated]'),
+                (
+                    'request', {
+                        'path': '/my/very/l...[truncated]', 'data': {
+                            'deep': '...[truncated]'
+                        }
+                    }
+                ),
+                (
+                    'nested',
+                    dictionary([
+                        ('items', [1, '...[truncated]', '...[truncated]']),
+                        ('path', '/my/very/l...[truncated]'),
+                    ])
+                ),
+                ('extra', ['a', 'b', '...[truncated]']),
+            ])
+        )
+
+    def test_max_record_size(self):
+        fmt = dictionary([('level', 'levelname'), ('message', 'message'), ('body', 'body')])
+        formatter = JsonFormatter(
+            fmt,
+            add_always_extra=True,
+            max_record_size=100,
+            drop_priority=['unknown', 'body', 'extra', 'message'],
+            **self.formatter_kwargs
+        )
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Simple message', None, None
+        )
+        record.body = 'x' * 100
+        record.extra = 'y' * 50
+        output = formatter.format(record)
+        self.assertLessEqual(len(output), 100)
+        self.assertDictEqual(
+            json.loads(output, object_pairs_hook=dictionary),
+            dictionary([
+                ('level', 'INFO'),
+                ('message', 'Simple message'),
+                ('body', '...[truncated]'),
+                ('extra', '...[truncated]'),
+            ])
+        )
+        record.body = 'small body'
+        record.extra = 'small extra'
+        self.assertDictEqual(
+            json.loads(formatter.format(record), object_pairs_hook=dictionary),
+            dictionary([
+                ('level', 'INFO'),
+                ('message', 'Simple message'),
+                ('body', 'small body'),
+                ('extra', 'small extra'),
+            ])
+        )
+
+    def test_max_record_size_nested_key(self):
+        fmt = dictionary([('message', 'message'), ('request', 'request')])
+        formatter = JsonFormatter(
+            fmt,
+            max_record_size=100,
+            drop_priority=['request.unknown', 'request.body.json'],
+            **self.formatter_kwargs
+        )
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Hello', None, None
+        )
+        body = {'json': 'x' * 100}
+        record.request = {'path': '/my/path', 'body': body}
+        output = formatter.format(record)
+        self.assertLessEqual(len(output), 100)
+        self.assertDictEqual(
+            json.loads(output),
+            {
+                'message': 'Hello',
+                'request': {
+                    'path': '/my/path', 'body': {
+                        'json': '...[truncated]'
+                    }
+                }
+            },
+        )
+        # The record values are not modified
+        self.assertEqual(record.request['body'], {'json': 'x' * 100})
+        self.assertIs(record.request['body'], body)
+
+    def test_max_record_size_bytes(self):
+        fmt = dictionary([('message', 'message'), ('body', 'body')])
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Hello', None, None
+        )
+        # 60 characters but 120 bytes once UTF-8 encoded
+        record.body = 'é' * 60
+        for kwargs in [{'ensure_ascii': False}, {'bytes_output': True}, {'sort_keys': True}]:
+            with self.subTest(**kwargs):
+                formatter = JsonFormatter(
+                    fmt,
+                    max_record_size=100,
+                    drop_priority=['body'],
+                    **kwargs,
+                )
+                output = formatter.format(record)
+                if isinstance(output, str):
+                    output = output.encode('utf-8')
+                self.assertLessEqual(len(output), 100)
+                self.assertEqual(json.loads(output)['body'], '...[truncated]')
+
+    def test_max_record_size_encode_once(self):
+        fmt = dictionary([('message', 'message'), ('body', 'body'), ('extra', 'extra')])
+        formatter = JsonFormatter(
+            fmt, max_record_size=50, drop_priority=['body', 'extra'], **self.formatter_kwargs
+        )
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Hello', None, None
+        )
+        record.body = {'data': 'x' * 100}
+        record.extra = {'data': 'y' * 100}
+        encoder = formatter._encoder  # pylint: disable=protected-access
+        with patch.object(encoder, 'encode_value', wraps=encoder.encode_value) as encode_value:
+            output = formatter.format(record)
+        self.assertDictEqual(
+            json.loads(output), {
+                'message': 'Hello', 'body': '...[truncated]', 'extra': '...[truncated]'
+            }
+        )
+        # Each value is encoded once (plus once by the pre-encoded fragments with pre_encode)
+        encoded = [call.args[0] for call in encode_value.call_args_list]
+        count = 2 if self.formatter_kwargs.get('pre_encode') else 1
+        self.assertEqual(encoded.count(record.body), count)
+        self.assertEqual(encoded.count(record.extra), count)
+
+        # The records within the budget are encoded as without budget (e.g. pre_encode)
+        record.body = record.extra = 'a'
+        encode_within_budget = formatter._encode_within_budget  # pylint: disable=protected-access
+        with patch.object(
+            formatter, '_encode_within_budget', wraps=encode_within_budget
+        ) as encode_within_budget:
+            output = formatter.format(record)
+        if self.formatter_kwargs.get('pre_encode'):
+            encode_within_budget.assert_not_called()
+        self.assertEqual(output, '{"message": "Hello", "body": "a", "extra": "a"}')
+
+    def test_level_and_logger_fmt(self):
+        formatter = JsonFormatter(
+            dictionary([('level', 'levelname'), ('message', 'message')]),
+            level_fmt={
+                'WARNING': dictionary([('level', 'levelname'), ('logger', 'name')]),
+                logging.ERROR: '{"level": "levelname", "time": "asctime"}',
+            },
+            logger_fmt={'app.db': dictionary([('db', 'levelname')])},
+            **self.formatter_kwargs
+        )
+
+        def format_record(name, level):
+            record = logging.LogRecord(name, level, __file__, 10, 'Message', None, None)
+            return list(json.loads(formatter.format(record), object_pairs_hook=dictionary))
+
+        for _ in range(2):
+            self.assertEqual(format_record('app', logging.DEBUG), ['level', 'message'])
+            self.assertEqual(format_record('app', logging.INFO), ['level', 'message'])
+            self.assertEqual(format_record('app', logging.WARNING), ['level', 'logger'])
+            self.assertEqual(format_record('app', logging.ERROR), ['level', 'time'])
+            self.assertEqual(format_record('app', logging.CRITICAL), ['level', 'time'])
+            self.assertEqual(format_record('app.db', logging.ERROR), ['db'])
+            self.assertEqual(format_record('app.db.query', logging.INFO), ['db'])
+            self.assertEqual(format_record('app.dbx', logging.INFO), ['level', 'message'])
+
+    def test_level_fmt_numeric_string(self):
+        # dictConfig from JSON or INI files gives the level_fmt keys as strings
+        formatter = JsonFormatter(
+            dictionary([('level', 'levelname'), ('message', 'message')]),
+            level_fmt={'30': dictionary([('level', 'levelname'), ('logger', 'name')])},
+            **self.formatter_kwargs
+        )
+        for level, keys in [(logging.INFO, ['level', 'message']),
+                            (logging.WARNING, ['level', 'logger'])]:
+            record = logging.LogRecord('app', level, __file__, 10, 'Message', None, None)
+            self.assertEqual(list(json.loads(formatter.format(record))), keys)
+
+    @params('UNKNOWN', 25, '25', 1.5)
+    def test_level_fmt_invalid_level(self, level):
+        with self.assertRaises(ValueError):
+            JsonFormatter(level_fmt={level: {'level': 'levelname'}}, **self.formatter_kwargs)
+
+    def test_constant_values(self):
+        with self.assertLogs('test_formatter', level=logging.DEBUG) as ctx:
+            logger = logging.getLogger('test_formatter')
+            self._configure_logger(
+                logger,
+                fmt=dictionary([
+                    ('level', 'levelname'),
+                    ('constants', dictionary([('int', 1), ('float', 1.5), ('bool', False)])),
+                    ('list', ['message', 2, True, None]),
+                    ('none', None),
+                    ('message', 'message'),
+                ])
+            )
+            logger.info('Simple message')
+        self.assertDictEqual(
+            json.loads(ctx.output[0], object_pairs_hook=dictionary),
+            dictionary([
+                ("level", "INFO"),
+                ("constants", dictionary([("int", 1), ("float", 1.5), ("bool", False)])),
+                ("list", ["Simple message", 2, True, None]),
+                ("none", None),
+                ("message", "Simple message"),
+            ])
+        )
+
+    def test_constant_values_remove_empty(self):
+        with self.assertLogs('test_formatter', level=logging.DEBUG) as ctx:
+            logger = logging.getLogger('test_formatter')
+            self._configure_logger(
+                logger,
+                fmt=dictionary([
+                    ('level', 'levelname'),
+                    ('zero', 0),
+                    ('list', [None, False]),
+                    ('none', None),
+                    ('message', 'message'),
+                ]),
+                remove_empty=True
+            )
+            logger.info('Simple message')
+        self.assertDictEqual(
+            json.loads(ctx.output[0], object_pairs_hook=dictionary),
+            dictionary([
+                ("level", "INFO"),
+                ("zero", 0),
+                ("list", [False]),
+                ("message", "Simple message"),
+            ])
+        )
+
+    def test_invalid_fmt_value(self):
+        with self.assertRaises(ValueError):
+            JsonFormatter(dictionary([('level', 'levelname'), ('invalid', {'a', 'b'})]))
+
     def test_base_config_already_configure(self):
         """
         Test if base_config is skipped if already configured
@@ -909,3 +1454,92 @@ class BasicJsonFormatterTest(unittest.TestCase):
         self.assertEqual(len(logging.root.handlers), 1)
         basic_config(level=logging.INFO)
         self.assertNotIsInstance(logging.root.handlers[0], logging.StreamHandler)
+
+
+class PreEncodeJsonFormatterTest(BasicJsonFormatterTest):
+    formatter_kwargs = {'pre_encode': True}
+
+    @params(
+        {},
+        {'remove_empty': True},
+        {'add_always_extra': True},
+        {
+            'add_always_extra': True, 'remove_empty': True
+        },
+        {'ensure_ascii': False},
+        {'separators': (',', ':')},
+    )
+    def test_pre_encode_same_output(self, kwargs):
+        fmt = dictionary([
+            ('level', 'levelname'),
+            ('empty', dictionary([('empty', 'empty_attr'), ('list', ['empty_attr'])])),
+            ('const', dictionary([('int', 1), ('bool', True), ('null', None)])),
+            ('request', ['request.path', '%(request.method)s', 'exc_info']),
+            ('overwritten', 'levelname'),
+            ('empty_overwritten', 'empty_attr'),
+            ('message', 'message'),
+        ])
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Composed message é %s', ('/',), None
+        )
+        record.empty_attr = ''
+        record.request = {'path': '/my/path', 'method': 'GET'}
+        record.overwritten = 'extra value'
+        record.empty_overwritten = 'extra value'
+        formatter = JsonFormatter(fmt, ignore_missing=True, **kwargs)
+        pre_encode_formatter = JsonFormatter(fmt, ignore_missing=True, pre_encode=True, **kwargs)
+        self.assertEqual(pre_encode_formatter.format(record), formatter.format(record))
+
+    @params({}, {'max_string_length': 4}, {'remove_empty': True}, {'add_always_extra': True})
+    def test_pre_encode_const_attributes(self, kwargs):
+        fmt = dictionary([('service', 'service'), ('version', 'version'), ('message', 'message')])
+        formatter = JsonFormatter(fmt, **kwargs)
+        const_formatter = JsonFormatter(
+            fmt, pre_encode=True, const_attributes=['service', 'version'], **kwargs
+        )
+        const_attribute = ConstAttribute(service='my-service', version='')
+        for i in range(3):
+            record = logging.LogRecord(
+                'test_formatter', logging.INFO, __file__, 10, 'Message %d', (i,), None
+            )
+            const_attribute.filter(record)
+            self.assertEqual(const_formatter.format(record), formatter.format(record))
+
+        # The value is encoded again when changed
+        const_attribute = ConstAttribute(service='other-service', version='1.0')
+        const_attribute.filter(record)
+        self.assertEqual(const_formatter.format(record), formatter.format(record))
+
+        # A modified attribute is encoded again (and is an extra with add_always_extra)
+        record.service = 'extra-service'
+        self.assertEqual(const_formatter.format(record), formatter.format(record))
+
+    @params('request.path', '%(service)s', '{service}', '${service}')
+    def test_pre_encode_const_attributes_invalid_name(self, name):
+        # Only the plain record attributes can be cached, a dotted key or a style format would
+        # output the value of the first record forever
+        with self.assertRaises(ValueError):
+            JsonFormatter({'path': name}, pre_encode=True, const_attributes=[name])
+
+    def test_const_attributes_without_pre_encode(self):
+        fmt = {'service': 'service', 'message': 'message'}
+        with self.assertWarns(UserWarning):
+            formatter = JsonFormatter(fmt, const_attributes=['service'])
+        self.assertEqual(formatter.const_attributes, frozenset())
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Hello', None, None
+        )
+        record.service = 'my-service'
+        self.assertEqual(formatter.format(record), '{"service": "my-service", "message": "Hello"}')
+
+    def test_pre_encode_not_supported(self):
+        with self.assertWarns(UserWarning):
+            formatter = JsonFormatter(pre_encode=True, indent=2)
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Simple message', None, None
+        )
+        self.assertEqual(
+            formatter.format(record),
+            '{\n  "levelname": "INFO",\n  "name": "test_formatter",\n'
+            '  "message": "Simple message"\n}'
+        )
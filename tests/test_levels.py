@@ -0,0 +1,18 @@
+import logging
+import unittest
+
+from nose2.tools import params
+
+from logging_utilities.levels import get_levelno
+
+
+class GetLevelnoTest(unittest.TestCase):
+
+    @params(('WARNING', logging.WARNING), (logging.INFO, logging.INFO), ('30', logging.WARNING))
+    def test_get_levelno(self, level, expected):
+        self.assertEqual(get_levelno(level), expected)
+
+    @params('UNKNOWN', 55, '55', 1.0, None)
+    def test_invalid_level(self, level):
+        with self.assertRaises(ValueError):
+            get_levelno(level)
@@ -2,13 +2,18 @@ import logging
 import unittest
 from logging import Formatter
 from logging import Logger
+from logging import LogRecord
 from logging import getLogRecordFactory
 from logging import setLogRecordFactory
 
 from nose2.tools import params
 
+from logging_utilities.context import get_logging_context
+from logging_utilities.context import remove_logging_context
+from logging_utilities.context.thread_context import ThreadMappingContext
 from logging_utilities.log_record import LogRecordIgnoreMissing
 from logging_utilities.log_record import _DictIgnoreMissing
+from logging_utilities.log_record import compose_log_record_factory
 from logging_utilities.log_record import reset_log_record_factory
 from logging_utilities.log_record import set_log_record_ignore_missing_factory
 
@@ -27,6 +32,9 @@ class DictIgnoreMissingTest(unittest.TestCase):
 
         dct = _DictIgnoreMissingX()
         self.assertEqual(dct['unknown'], default)
+        # The missing keys are not added to the dictionary
+        self.assertNotIn('unknown', dct)
+        self.assertIsNone(dct.get('unknown'))
 
 
 class LogRecordIgnoreMissingTest(unittest.TestCase):
@@ -155,3 +163,63 @@ class LoggerIgnoreMissingTest(unittest.TestCase):
         self.assertEqual(ctx.output, [
             'INFO:Simple message:bar:',
         ])
+
+
+class ComposedLogRecordFactoryTest(unittest.TestCase):
+
+    def tearDown(self):
+        reset_log_record_factory()
+        remove_logging_context()
+        super().tearDown()
+
+    def test_composed_factory(self):
+        context = ThreadMappingContext()
+        context['request_id'] = 'abc'
+        factory = compose_log_record_factory(
+            base_factory=LogRecord,
+            context=context,
+            constants={'service': 'my-service'},
+            ignore_missing=True,
+            dft_value='-'
+        )
+        record = factory('my-record', logging.INFO, 'test', 0, 'my message', None, None)
+        self.assertIsInstance(record, LogRecord)
+        self.assertEqual(record.service, 'my-service')
+        self.assertIs(record.context, context)
+        self.assertEqual(record.__dict__['unknown'], '-')
+        self.assertEqual(
+            Formatter('%(service)s:%(context)s:%(message)s:%(unknown)s').format(record),
+            "my-service:{'request_id': 'abc'}:my message:-"
+        )
+
+    def test_composed_factory_chain(self):
+        original_factory = getLogRecordFactory()
+
+        def record_factory(*args, **kwargs):
+            record = original_factory(*args, **kwargs)
+            record.foo = 'bar'
+            return record
+
+        setLogRecordFactory(record_factory)
+        setLogRecordFactory(compose_log_record_factory(constants={'service': 'my-service'}))
+        with self.assertLogs('test_formatter', level=logging.DEBUG) as ctx:
+            logger = logging.getLogger('test_formatter')
+            for handler in logger.handlers:
+                handler.setFormatter(Formatter('%(message)s:%(foo)s:%(service)s'))
+            logger.info('Simple message')
+        self.assertEqual(ctx.output, ['Simple message:bar:my-service'])
+
+    def test_composed_factory_logging_context(self):
+        factory = compose_log_record_factory(
+            base_factory=LogRecord, context={'request_id': 'abc'}, logging_context=True
+        )
+        context = get_logging_context()
+        self.assertIsInstance(context, ThreadMappingContext)
+        record = factory('my-record', logging.INFO, 'test', 0, 'my message', None, None)
+        self.assertIs(record.context, context)
+        self.assertEqual(record.context, {'request_id': 'abc'})
+        get_logging_context()['user'] = 'me'
+        self.assertEqual(record.context, {'request_id': 'abc', 'user': 'me'})
+
+    def test_composed_factory_without_feature(self):
+        self.assertIs(compose_log_record_factory(base_factory=LogRecord), LogRecord)
@@ -0,0 +1,71 @@
+import logging
+import unittest
+
+from nose2.tools import params
+
+from logging_utilities.filters import LevelFilter
+from logging_utilities.filters import LoggersLevelFilter
+
+
+def make_record(name, level):
+    return logging.LogRecord(name, level, __file__, 10, 'message', None, None)
+
+
+class LoggersLevelFilterTest(unittest.TestCase):
+
+    @params(
+        ('A', logging.DEBUG, False),
+        ('A', logging.WARNING, True),
+        ('A.child', logging.INFO, False),
+        ('A.child', logging.ERROR, True),
+        ('AB', logging.DEBUG, True),
+        ('A.B', logging.INFO, True),
+        ('A.B.C', logging.DEBUG, False),
+        ('A.B.C', logging.INFO, True),
+        ('B', logging.DEBUG, True),
+        ('root', logging.DEBUG, True),
+    )
+    def test_filter(self, name, level, expected):
+        level_filter = LoggersLevelFilter({'A': 'WARNING', 'A.B': logging.INFO})
+        self.assertEqual(level_filter.filter(make_record(name, level)), expected)
+        # Second time from the cache
+        self.assertEqual(level_filter.filter(make_record(name, level)), expected)
+
+    def test_default_level(self):
+        level_filter = LoggersLevelFilter({'': 'INFO', 'A': 'DEBUG'})
+        self.assertFalse(level_filter.filter(make_record('B', logging.DEBUG)))
+        self.assertTrue(level_filter.filter(make_record('B', logging.INFO)))
+        self.assertTrue(level_filter.filter(make_record('A.child', logging.DEBUG)))
+        self.assertEqual(level_filter.get_level('A'), logging.DEBUG)
+        self.assertEqual(level_filter.get_level('AB'), logging.INFO)
+
+    def test_numeric_string_level(self):
+        level_filter = LoggersLevelFilter({'A': '30'})
+        self.assertEqual(level_filter.get_level('A'), logging.WARNING)
+        self.assertEqual(LevelFilter('20', 'A').level, logging.INFO)
+
+    def test_no_levels(self):
+        self.assertTrue(LoggersLevelFilter().filter(make_record('A', logging.DEBUG)))
+
+    @params({'A': 'UNKNOWN'}, {'A': 55}, {'A': '55'}, {'A': 1.0})
+    def test_invalid_level(self, levels):
+        with self.assertRaises(ValueError):
+            LoggersLevelFilter(levels)
+        with self.assertRaises(ValueError):
+            LevelFilter(levels['A'], 'A')
+
+    def test_logger(self):
+        with self.assertLogs('test_loggers_level', level=logging.DEBUG) as ctx:
+            logger = logging.getLogger('test_loggers_level')
+            for handler in logger.handlers:
+                handler.addFilter(LoggersLevelFilter({'test_loggers_level.noisy': 'WARNING'}))
+            logger.debug('debug message')
+            logger.getChild('noisy').info('noisy info message')
+            logger.getChild('noisy').warning('noisy warning message')
+        self.assertEqual(
+            ctx.output,
+            [
+                'DEBUG:test_loggers_level:debug message',
+                'WARNING:test_loggers_level.noisy:noisy warning message',
+            ]
+        )
@@ -0,0 +1,92 @@
+import dataclasses
+import datetime
+import decimal
+import enum
+import ipaddress
+import json
+import logging
+import pathlib
+import unittest
+import uuid
+
+from nose2.tools import params
+
+from logging_utilities.formatters.json_formatter import JsonFormatter
+from logging_utilities.serializers import get_serializer
+from logging_utilities.serializers import register_serializer
+from logging_utilities.serializers import serialize
+
+
+class Color(enum.Enum):
+    RED = 'red'
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+class Custom:
+
+    def __str__(self):
+        return 'custom'
+
+
+class SubCustom(Custom):
+    pass
+
+
+class SerializersTest(unittest.TestCase):
+
+    @params(
+        (datetime.datetime(2020, 1, 2, 3, 4, 5, 6), '2020-01-02T03:04:05.000006'),
+        (datetime.date(2020, 1, 2), '2020-01-02'),
+        (datetime.time(3, 4, 5), '03:04:05'),
+        (uuid.UUID(int=1), '00000000-0000-0000-0000-000000000001'),
+        (decimal.Decimal('1.10'), '1.10'),
+        (Color.RED, 'red'),
+        (b'bytes \xc3\xa9 \xff', 'bytes é \\xff'),
+        (bytearray(b'bytes'), 'bytes'),
+        (frozenset([1]), [1]),
+        (pathlib.PurePosixPath('/my/path'), '/my/path'),
+        (ipaddress.ip_address('192.168.1.1'), '192.168.1.1'),
+        (ipaddress.ip_network('192.168.1.0/24'), '192.168.1.0/24'),
+        (Point(1, 2), {
+            'x': 1, 'y': 2
+        }),
+        (Custom(), 'custom'),
+    )
+    def test_serialize(self, value, expected):
+        self.assertEqual(serialize(value), expected)
+
+    def test_register_serializer(self):
+        self.assertIsNone(get_serializer(SubCustom))
+        register_serializer(Custom, lambda value: {'custom': True})
+        try:
+            self.assertEqual(serialize(Custom()), {'custom': True})
+            self.assertEqual(serialize(SubCustom()), {'custom': True})
+        finally:
+            register_serializer(Custom, str)
+
+    def test_json_formatter(self):
+        formatter = JsonFormatter({'message': 'message'}, add_always_extra=True)
+        record = logging.LogRecord(
+            'test_formatter', logging.INFO, __file__, 10, 'Simple message', None, None
+        )
+        record.date = datetime.date(2020, 1, 2)
+        record.ids = {uuid.UUID(int=1)}
+        record.point = Point(1, 2)
+        record.custom = Custom()
+        self.assertDictEqual(
+            json.loads(formatter.format(record)),
+            {
+                'message': 'Simple message',
+                'date': '2020-01-02',
+                'ids': ['00000000-0000-0000-0000-000000000001'],
+                'point': {
+                    'x': 1, 'y': 2
+                },
+                'custom': 'custom',
+            }
+        )
@@ -0,0 +1,109 @@
+import json
+import linecache
+import logging
+import sys
+import traceback
+import unittest
+from unittest.mock import patch
+
+from logging_utilities.formatters.json_formatter import JsonFormatter
+from logging_utilities.formatters.structured_exception import \
+    structure_exception
+from logging_utilities.formatters.structured_exception import structure_stack
+
+from tests import exception_helpers
+from tests.exception_helpers import get_exception
+from tests.exception_helpers import raise_chained_error
+from tests.exception_helpers import raise_context_error
+from tests.exception_helpers import raise_error
+
+
+class StructureExceptionTest(unittest.TestCase):
+
+    def test_exception(self):
+        structure = structure_exception(get_exception(raise_error, 'message'))
+        self.assertEqual(structure['type'], 'ValueError')
+        self.assertEqual(structure['message'], 'message')
+        self.assertEqual([frame['function'] for frame in structure['frames']],
+                         ['get_exception', 'raise_error'])
+        self.assertEqual(structure['frames'][-1]['file'], exception_helpers.__file__)
+        self.assertEqual(structure['frames'][-1]['code'], 'raise ValueError(message)')
+        self.assertNotIn('cause', structure)
+        self.assertNotIn('context', structure)
+
+    def test_chained_exception(self):
+        structure = structure_exception(get_exception(raise_chained_error, 'message'))
+        self.assertEqual(structure['type'], exception_helpers.__name__ + '.CustomError')
+        self.assertEqual(structure['cause']['type'], 'ValueError')
+        self.assertEqual(structure['cause']['message'], 'message')
+        self.assertNotIn('context', structure)
+
+        structure = structure_exception(get_exception(raise_context_error, 'message'))
+        self.assertEqual(structure['type'], 'KeyError')
+        self.assertEqual(structure['context']['type'], 'ValueError')
+        self.assertNotIn('cause', structure)
+
+    def test_exception_cycle(self):
+        error = ValueError('cycle')
+        error.__context__ = KeyError('context')
+        error.__context__.__context__ = error
+        structure = structure_exception(error)
+        self.assertEqual(structure['context']['type'], 'KeyError')
+        self.assertNotIn('context', structure['context'])
+
+    def test_frames_cache(self):
+        with patch(
+            'logging_utilities.formatters.structured_exception.linecache.getline',
+            wraps=linecache.getline
+        ) as getline:
+            first = structure_exception(get_exception(raise_error, 'first'))
+            second = structure_exception(get_exception(raise_error, 'second'))
+        self.assertIs(first['frames'][-1], second['frames'][-1])
+        self.assertLessEqual(getline.call_count, len(first['frames']))
+
+    def test_stack(self):
+        stack_info = 'Stack (most recent call last):\n' + ''.join(
+            traceback.format_stack(sys._getframe())  # pylint: disable=protected-access
+        ).rstrip('\n')
+        frames = structure_stack(stack_info)
+        self.assertEqual(frames[-1]['function'], 'test_stack')
+        self.assertEqual(frames[-1]['file'], __file__)
+        self.assertTrue(frames[-1]['code'].startswith('traceback.format_stack('))
+        self.assertIs(structure_stack(stack_info), frames)
+
+
+class StructuredExcJsonFormatterTest(unittest.TestCase):
+
+    def test_json_formatter(self):
+        fmt = {'message': 'message', 'exc_info': 'exc_info', 'exception': 'exc_text'}
+        formatter = JsonFormatter(fmt, structured_exc=True)
+        error = get_exception(raise_chained_error, 'message')
+        record = logging.LogRecord(
+            'test', logging.ERROR, __file__, 10, 'Error', None, (type(error), error, None)
+        )
+        output = json.loads(formatter.format(record))
+        self.assertEqual(output['message'], 'Error')
+        self.assertTrue(output['exc_info'])
+        self.assertEqual(output['exception'], structure_exception(error))
+        self.assertIsNone(record.exc_text)
+
+        # Without exception the exception text is used
+        record = logging.LogRecord('test', logging.INFO, __file__, 10, 'Info', None, None)
+        self.assertEqual(
+            json.loads(formatter.format(record)), {
+                'message': 'Info', 'exc_info': False, 'exception': None
+            }
+        )
+
+    def test_json_formatter_stack(self):
+        fmt = {'message': 'message', 'stack': 'stack_info'}
+        formatter = JsonFormatter(fmt, structured_exc=True)
+        logger = logging.getLogger('test_structured_exc')
+        with self.assertLogs(logger, level=logging.INFO) as ctx:
+            logger.handlers[0].setFormatter(formatter)
+            logger.info('Message with stack', stack_info=True)
+        output = json.loads(ctx.output[0])
+        self.assertEqual(output['stack'][-1]['function'], 'test_json_formatter_stack')
+        self.assertEqual(
+            output['stack'][-1]['code'], "logger.info('Message with stack', stack_info=True)"
+        )
@@ -0,0 +1,92 @@
+import logging
+import time
+import unittest
+from datetime import datetime
+from datetime import timezone
+
+from nose2.tools import params
+
+from logging_utilities.filters import TimeAttribute
+from logging_utilities.formatters.json_formatter import JsonFormatter
+from logging_utilities.timestamps import IsoTimestamp
+from logging_utilities.timestamps import StrftimeTimestamp
+
+TIMESTAMPS = [
+    1600000000,
+    1600000000.000001,
+    1600000000.1234564,
+    1600000000.1234565,
+    1600000000.5,
+    1600000000.9999996,
+    1600000001.25,
+    1600000001.999,
+    1600000060.001,
+    1679792399.5,  # Daylight saving time change in Europe
+    1679792400.5,
+    1698541200.5,
+]
+
+
+def make_record(created):
+    record = logging.LogRecord('test', logging.INFO, __file__, 10, 'Message', None, None)
+    record.created = created
+    record.msecs = (created - int(created)) * 1000
+    return record
+
+
+class TimestampsTest(unittest.TestCase):
+
+    def test_iso_timestamp(self):
+        renderer = IsoTimestamp()
+        for created in TIMESTAMPS:
+            self.assertEqual(
+                renderer.render(created), datetime.fromtimestamp(created).astimezone().isoformat()
+            )
+
+    def test_iso_timestamp_utc(self):
+        renderer = IsoTimestamp(utc=True)
+        for created in TIMESTAMPS:
+            self.assertEqual(
+                renderer.render(created),
+                datetime.fromtimestamp(created, tz=timezone.utc).isoformat().replace('+00:00', 'Z')
+            )
+
+    @params((time.localtime, None), (time.gmtime, None), (time.localtime, '%Y-%m-%dT%H:%M:%S'))
+    def test_strftime_timestamp(self, converter, datefmt):
+        formatter = logging.Formatter(datefmt=datefmt)
+        formatter.converter = converter
+        renderer = StrftimeTimestamp(converter, datefmt)
+        for created in TIMESTAMPS:
+            record = make_record(created)
+            self.assertEqual(
+                renderer.render(record.created, record.msecs),
+                formatter.formatTime(record, datefmt)
+            )
+
+    def test_json_formatter_format_time(self):
+        formatter = JsonFormatter({'time': 'asctime'})
+        for converter in [time.localtime, time.gmtime]:
+            formatter.converter = converter
+            reference = logging.Formatter()
+            reference.converter = converter
+            for created in TIMESTAMPS:
+                record = make_record(created)
+                self.assertEqual(formatter.formatTime(record), reference.formatTime(record))
+                self.assertEqual(
+                    formatter.formatTime(record, '%H:%M:%S'),
+                    reference.formatTime(record, '%H:%M:%S')
+                )
+
+    def test_time_attribute(self):
+        time_filter = TimeAttribute(isotime=True, utc_isotime=True)
+        for created in TIMESTAMPS:
+            record = make_record(created)
+            time_filter.filter(record)
+            self.assertEqual(
+                record.__dict__['isotime'],
+                datetime.fromtimestamp(created).astimezone().isoformat()
+            )
+            self.assertEqual(
+                record.__dict__['utc_isotime'],
+                datetime.fromtimestamp(created, tz=timezone.utc).isoformat().replace('+00:00', 'Z')
+            )